@@ -4,11 +4,58 @@ Data loading and management for refund cases.
 import csv
 import os
 from pathlib import Path
-from typing import List
-import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from app.schemas import CaseData, ComplaintType
 
+# Prefer a C/Arrow CSV parser when one is installed
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    _CSV_ENGINE = "pyarrow"
+except ImportError:
+    try:
+        import pandas as pd
+        _CSV_ENGINE = "pandas"
+    except ImportError:
+        _CSV_ENGINE = "csv"
+
+
+# Lookup tables for coercing CSV strings without per-row validation
+_COMPLAINT_TYPES = {m.value: m for m in ComplaintType}
+TRUE_SET = frozenset(('true', '1', 'yes'))
+
+# Explicit column types for the pyarrow/pandas readers
+_COLUMN_TYPES = {
+    'case_id': 'string',
+    'order_value': 'float64',
+    'delivery_delay_min': 'int64',
+    'restaurant_error_rate': 'float64',
+    'customer_refund_rate': 'float64',
+    'complaint_type': 'string',
+    # Booleans are read as text and coerced with TRUE_SET like the csv
+    # reader does, so blank or unrecognized cells become False
+    'photo_provided': 'string',
+    'is_demo': 'string',
+    'complaint_text': 'string',
+}
+_BOOL_COLUMNS = ('photo_provided', 'is_demo')
+# pyarrow read block size; bigger blocks mean fewer, larger parse tasks
+_ARROW_BLOCK_SIZE = 8 << 20
+
+# Numeric columns handed to the batch engine as NumPy arrays
+_NUMERIC_COLUMNS = (
+    'order_value',
+    'delivery_delay_min',
+    'restaurant_error_rate',
+    'customer_refund_rate',
+    'photo_provided',
+)
+
+
 
 def generate_sample_dataset(filepath: str, num_cases: int = 50) -> None:
     """
@@ -21,44 +68,36 @@ def generate_sample_dataset(filepath: str, num_cases: int = 50) -> None:
     # Ensure directory exists
     Path(filepath).parent.mkdir(parents=True, exist_ok=True)
     
-    complaint_types = list(ComplaintType)
+    rng = np.random.default_rng()
+    
+    # Delays are drawn from one of three ranges: on time or slightly late,
+    # moderately late, very late
+    delay_low = np.array([0, 15, 45])
+    delay_high = np.array([15, 45, 120])
+    delay_range = rng.integers(0, 3, num_cases)
+    
+    columns = {
+        'case_id': [f"CASE{i+1:04d}" for i in range(num_cases)],
+        'order_value': rng.uniform(10.0, 150.0, num_cases).round(2),
+        'delivery_delay_min': rng.integers(delay_low[delay_range], delay_high[delay_range], endpoint=True),
+        'restaurant_error_rate': rng.uniform(0.0, 0.5, num_cases).round(2),
+        'customer_refund_rate': rng.uniform(0.0, 0.6, num_cases).round(2),
+        'complaint_type': rng.choice([ct.value for ct in ComplaintType], num_cases),
+        'photo_provided': rng.random(num_cases) < 0.5,
+        'is_demo': np.zeros(num_cases, dtype=bool),
+    }
+    
+    if _CSV_ENGINE == "pyarrow":
+        pacsv.write_csv(pa.table(columns), filepath)
+        return
     
     with open(filepath, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
-        writer.writerow([
-            'case_id',
-            'order_value',
-            'delivery_delay_min',
-            'restaurant_error_rate',
-            'customer_refund_rate',
-            'complaint_type',
-            'photo_provided',
-            'is_demo'
-        ])
-        
-        for i in range(num_cases):
-            case_id = f"CASE{i+1:04d}"
-            order_value = round(random.uniform(10.0, 150.0), 2)
-            delivery_delay_min = random.choice([
-                random.randint(0, 15),      # On time or slightly late
-                random.randint(15, 45),     # Moderately late
-                random.randint(45, 120)     # Very late
-            ])
-            restaurant_error_rate = round(random.uniform(0.0, 0.5), 2)
-            customer_refund_rate = round(random.uniform(0.0, 0.6), 2)
-            complaint_type = random.choice(complaint_types).value
-            photo_provided = random.choice([True, False])
-            
-            writer.writerow([
-                case_id,
-                order_value,
-                delivery_delay_min,
-                restaurant_error_rate,
-                customer_refund_rate,
-                complaint_type,
-                photo_provided,
-                False  # is_demo
-            ])
+        writer.writerow(columns.keys())
+        writer.writerows(zip(*(
+            values if isinstance(values, list) else values.tolist()
+            for values in columns.values()
+        )))
 
 
 def load_cases_from_csv(filepath: str) -> List[CaseData]:
@@ -75,32 +114,168 @@ def load_cases_from_csv(filepath: str) -> List[CaseData]:
         print(f"CSV not found at {filepath}. Generating sample dataset...")
         generate_sample_dataset(filepath)
     
-    cases = []
+    return [_case_from_row(row) for row in _read_rows(filepath)]
+
+
+def load_cases_and_columns(filepath: str) -> Tuple[List[CaseData], Optional[Dict[str, np.ndarray]]]:
+    """
+    Load cases from CSV file together with per-field NumPy columns.
+    
+    The columns let the batch engine skip unpacking the CaseData objects.
+    They come from the same Arrow table as the cases, without a copy
+    where Arrow's memory layout allows it.
+    
+    Args:
+        filepath: Path to the CSV file
+        
+    Returns:
+        (cases, columns). columns maps field name to an array aligned
+        with cases, with complaint_type as int8 codes in ComplaintType
+        order. It is None when pyarrow is not installed.
+    """
+    if _CSV_ENGINE != "pyarrow":
+        return load_cases_from_csv(filepath), None
+    
+    if not os.path.exists(filepath):
+        print(f"CSV not found at {filepath}. Generating sample dataset...")
+        generate_sample_dataset(filepath)
+    
+    table = _arrow_read_csv(filepath)
+    cases = [_case_from_row(row) for row in table.to_pylist()]
+    
+    columns = {name: table.column(name).to_numpy() for name in _NUMERIC_COLUMNS}
+    columns['complaint_type'] = pc.index_in(
+        table.column('complaint_type'),
+        value_set=pa.array([ct.value for ct in ComplaintType])
+    ).to_numpy().astype(np.int8)
+    return cases, columns
+
+
+def iter_cases_from_csv(filepath: str, batch_size: int = 10_000) -> Iterator[List[CaseData]]:
+    """
+    Stream cases from a CSV file in batches.
+    
+    Unlike load_cases_from_csv, only about one batch of rows is held in
+    memory at a time, so this suits files too large to load at once.
+    
+    Args:
+        filepath: Path to the CSV file
+        batch_size: Maximum number of cases per batch
+        
+    Yields:
+        Lists of at most batch_size CaseData objects
+    """
+    batch = []
+    for row in _iter_rows(filepath, batch_size):
+        batch.append(_case_from_row(row))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _arrow_convert_options() -> "pacsv.ConvertOptions":
+    """Column types for the pyarrow reader."""
+    return pacsv.ConvertOptions(column_types=_COLUMN_TYPES)
+
+
+def _arrow_coerce_bools(table: "pa.Table") -> "pa.Table":
+    """Replace the text boolean columns with booleans (TRUE_SET spellings are True)."""
+    true_set = pa.array(sorted(TRUE_SET))
+    for name in _BOOL_COLUMNS:
+        i = table.schema.get_field_index(name)
+        if i >= 0:
+            table = table.set_column(i, name, pc.is_in(pc.utf8_lower(table.column(i)), value_set=true_set))
+    return table
+
+
+def _arrow_read_csv(filepath: str) -> "pa.Table":
+    """Read the whole CSV into an Arrow table."""
+    return _arrow_coerce_bools(pacsv.read_csv(
+        filepath,
+        read_options=pacsv.ReadOptions(block_size=_ARROW_BLOCK_SIZE),
+        convert_options=_arrow_convert_options()
+    ))
+
+
+def _pandas_read_csv(filepath: str, **kwargs):
+    """Call pandas.read_csv with the explicit column types."""
+    return pd.read_csv(
+        filepath,
+        dtype=_COLUMN_TYPES,
+        keep_default_na=False,
+        engine='c',
+        **kwargs
+    )
+
+
+def _pandas_coerce_bools(df):
+    """Replace the text boolean columns with booleans (TRUE_SET spellings are True)."""
+    for name in _BOOL_COLUMNS:
+        if name in df.columns:
+            df[name] = df[name].str.lower().isin(TRUE_SET)
+    return df
+
+
+def _frame_rows(df) -> List[dict]:
+    """Convert a DataFrame to row dicts holding Python scalars."""
+    columns = list(df.columns)
+    return [dict(zip(columns, values)) for values in df.itertuples(index=False, name=None)]
+
+
+def _coerce_csv_row(row: dict) -> dict:
+    """Convert the boolean columns of a csv.DictReader row."""
+    row['photo_provided'] = row['photo_provided'].lower() in TRUE_SET
+    if 'is_demo' in row:
+        row['is_demo'] = row['is_demo'].lower() in TRUE_SET
+    return row
+
+
+def _read_rows(filepath: str) -> List[dict]:
+    """Parse the CSV into row dicts with the selected parser."""
+    if _CSV_ENGINE == "pyarrow":
+        return _arrow_read_csv(filepath).to_pylist()
+    
+    if _CSV_ENGINE == "pandas":
+        return _frame_rows(_pandas_coerce_bools(_pandas_read_csv(filepath)))
+    
     with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Handle is_demo field gracefully - default to False if not present
-            is_demo = False
-            if 'is_demo' in row:
-                is_demo = row['is_demo'].lower() in ('true', '1', 'yes')
-            
-            # Handle complaint_text field gracefully - default to None if not present
-            complaint_text = None
-            if 'complaint_text' in row and row['complaint_text']:
-                complaint_text = row['complaint_text']
-            
-            case = CaseData(
-                case_id=row['case_id'],
-                order_value=float(row['order_value']),
-                delivery_delay_min=int(row['delivery_delay_min']),
-                restaurant_error_rate=float(row['restaurant_error_rate']),
-                customer_refund_rate=float(row['customer_refund_rate']),
-                complaint_type=ComplaintType(row['complaint_type']),
-                photo_provided=row['photo_provided'].lower() in ('true', '1', 'yes'),
-                is_demo=is_demo,
-                complaint_text=complaint_text
-            )
-            cases.append(case)
-    
-    return cases
+        return [_coerce_csv_row(row) for row in csv.DictReader(f)]
+
 
+def _iter_rows(filepath: str, chunk_rows: int) -> Iterator[dict]:
+    """Parse the CSV incrementally, yielding row dicts."""
+    if _CSV_ENGINE == "pyarrow":
+        for record_batch in pacsv.open_csv(filepath, convert_options=_arrow_convert_options()):
+            yield from _arrow_coerce_bools(pa.Table.from_batches([record_batch])).to_pylist()
+    
+    elif _CSV_ENGINE == "pandas":
+        for df in _pandas_read_csv(filepath, chunksize=chunk_rows):
+            yield from _frame_rows(_pandas_coerce_bools(df))
+    
+    else:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                yield _coerce_csv_row(row)
+
+
+def _case_from_row(row: dict) -> CaseData:
+    """
+    Build a CaseData from a parsed CSV row.
+    
+    CSV data is trusted: values are coerced here, so pydantic
+    validation is skipped.
+    """
+    return CaseData.model_construct(
+        case_id=row['case_id'],
+        order_value=float(row['order_value']),
+        delivery_delay_min=int(row['delivery_delay_min']),
+        restaurant_error_rate=float(row['restaurant_error_rate']),
+        customer_refund_rate=float(row['customer_refund_rate']),
+        complaint_type=_COMPLAINT_TYPES[row['complaint_type']],
+        photo_provided=bool(row['photo_provided']),
+        # is_demo and complaint_text are optional columns
+        is_demo=bool(row.get('is_demo')),
+        complaint_text=row.get('complaint_text') or None
+    )
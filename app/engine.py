@@ -1,7 +1,13 @@
 """
 Rule-based refund decision engine with explainable scoring.
 """
-from typing import List, Optional
+import os
+import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
 
 from app.schemas import (
     CaseData,
@@ -12,6 +18,529 @@ from app.schemas import (
 )
 
 
+# Severity score and explanation per complaint type
+_SEVERITY_SCORE = {
+    ComplaintType.NEVER_ARRIVED: 35,
+    ComplaintType.DAMAGED_FOOD: 25,
+    ComplaintType.WRONG_ORDER: 20,
+    ComplaintType.MISSING_ITEMS: 18,
+    ComplaintType.QUALITY_ISSUE: 15,
+    ComplaintType.LATE_DELIVERY: 10,
+}
+
+_SEVERITY_EXPLAIN = {
+    ComplaintType.NEVER_ARRIVED: "Order never arrived - critical issue",
+    ComplaintType.DAMAGED_FOOD: "Food damaged - health and safety concern",
+    ComplaintType.WRONG_ORDER: "Wrong order delivered - clear mistake",
+    ComplaintType.MISSING_ITEMS: "Items missing from order",
+    ComplaintType.QUALITY_ISSUE: "Quality concern reported",
+    ComplaintType.LATE_DELIVERY: "Delivery was late",
+}
+
+# Integer code for each complaint type, and the severity score indexed by it.
+# The batch paths map each case's enum to its code once and index the LUT,
+# which also keeps the Numba kernel free of str enums.
+_CT_INDEX = {ct: i for i, ct in enumerate(ComplaintType)}
+SEVERITY_LUT = np.array([_SEVERITY_SCORE[ct] for ct in ComplaintType], dtype=np.float64)
+
+# Ladder rules: a value falls in bin bisect_right(THR, x) and gets
+# SCORES[bin] with explanation EXPLAIN[bin]
+_DELAY_THR = (15, 30, 60)
+_DELAY_SCORES = (0, 5, 12, 20)
+_DELAY_EXPLAIN = (
+    "Minimal delay ({} min) - within acceptable range",
+    "Moderate delay ({} min) - minor inconvenience",
+    "Significant delay ({} min) - customer inconvenienced",
+    "Severe delay ({} min) - highly unacceptable",
+)
+
+_RE_THR = (0.05, 0.15, 0.3)
+_RE_SCORES = (0, 3, 8, 15)
+_RE_EXPLAIN = (
+    "Excellent restaurant record ({:.0%})",
+    "Low restaurant error rate ({:.0%})",
+    "Moderate restaurant error rate ({:.0%})",
+    "High restaurant error rate ({:.0%}) - pattern of issues",
+)
+
+_CUST_THR = (0.1, 0.2, 0.4)
+_CUST_SCORES = (5, -3, -8, -15)
+_CUST_EXPLAIN = (
+    "Excellent customer history ({:.0%}) - trustworthy",
+    "Moderate customer refund rate ({:.0%})",
+    "Elevated customer refund rate ({:.0%}) - requires scrutiny",
+    "High customer refund rate ({:.0%}) - possible abuse pattern",
+)
+
+_VALUE_THR = (20, 50, 100)
+_VALUE_SCORES = (0, 2, 5, 10)
+_VALUE_EXPLAIN = (
+    "Low-value order (${:.2f})",
+    "Standard order value (${:.2f})",
+    "Medium-value order (${:.2f})",
+    "High-value order (${:.2f}) - important customer",
+)
+
+# Array form of the ladders for the batch path (np.searchsorted, side='right')
+DELAY_BINS = np.array(_DELAY_THR)
+DELAY_SCORES = np.array(_DELAY_SCORES, dtype=np.float64)
+
+RESTAURANT_BINS = np.array(_RE_THR)
+RESTAURANT_SCORES = np.array(_RE_SCORES, dtype=np.float64)
+
+CUSTOMER_BINS = np.array(_CUST_THR)
+CUSTOMER_SCORES = np.array(_CUST_SCORES, dtype=np.float64)
+
+VALUE_BINS = np.array(_VALUE_THR)
+VALUE_SCORES = np.array(_VALUE_SCORES, dtype=np.float64)
+
+
+def _ladder_source(var: str, thresholds: tuple, scores: tuple) -> str:
+    """Emit an if/elif chain adding scores[bisect_right(thresholds, var)] to s."""
+    lines = []
+    for i in reversed(range(len(thresholds))):
+        keyword = "if" if i == len(thresholds) - 1 else "elif"
+        lines.append(f"    {keyword} {var} >= {thresholds[i]!r}:")
+        lines.append(f"        s += {scores[i + 1]!r}")
+    lines.append("    else:")
+    lines.append(f"        s += {scores[0]!r}")
+    return "\n".join(lines)
+
+
+# Single-case scorer for the six structured rules, generated at import with
+# every threshold and score inlined as a constant; ct is the _CT_INDEX code
+_SCORE_ROW_SOURCE = "\n".join([
+    "def _score_row(order_value, delay, rer, cur, photo, ct):",
+    f"    s = {tuple(_SEVERITY_SCORE[ct] for ct in ComplaintType)!r}[ct]",
+    _ladder_source("delay", _DELAY_THR, _DELAY_SCORES),
+    _ladder_source("rer", _RE_THR, _RE_SCORES),
+    _ladder_source("cur", _CUST_THR, _CUST_SCORES),
+    "    s += 10 if photo else -5",
+    _ladder_source("order_value", _VALUE_THR, _VALUE_SCORES),
+    "    return s",
+])
+exec(_SCORE_ROW_SOURCE, globals())
+_score_row = globals()['_score_row']
+
+# Text features packed into the (N, 9) matrix used by the batch path;
+# booleans are stored as 0/1
+TEXT_FEATURES = (
+    "food_quality_issue",
+    "missing_item",
+    "wrong_item",
+    "temperature_problem",
+    "packaging_problem",
+    "delivery_spill",
+    "vague_complaint",
+    "customer_aggression",
+    "evidence_strength",
+)
+
+# Column layout of the matrix returned by score_cases_batch
+BATCH_COLUMNS = (
+    "score", "severity", "delay", "restaurant", "customer", "evidence", "value", "vague", "text"
+)
+_N_COLUMNS = len(BATCH_COLUMNS)
+
+# Policy rule code weighting each contribution column (BATCH_COLUMNS[1:])
+RULE_CODES = (
+    "COMPLAINT_SEVERITY",
+    "HIGH_DELAY",
+    "RESTAURANT_ERROR",
+    "CUSTOMER_RISK",
+    "PHOTO_EVIDENCE",
+    "ORDER_VALUE",
+    "VAGUE_COMPLAINT",
+    "TEXT_SIGNALS",
+)
+RULE_INDEX = {code: i for i, code in enumerate(RULE_CODES)}
+
+# Rule index for each DecisionReason factor; other TEXT_SIGNAL_* factors
+# belong to TEXT_SIGNALS
+_FACTOR_RULE = {
+    "Complaint Severity": RULE_INDEX["COMPLAINT_SEVERITY"],
+    "Delivery Delay": RULE_INDEX["HIGH_DELAY"],
+    "Restaurant Reliability": RULE_INDEX["RESTAURANT_ERROR"],
+    "Customer History": RULE_INDEX["CUSTOMER_RISK"],
+    "Evidence Quality": RULE_INDEX["PHOTO_EVIDENCE"],
+    "Order Value": RULE_INDEX["ORDER_VALUE"],
+    "TEXT_SIGNAL_VagueComplaint": RULE_INDEX["VAGUE_COMPLAINT"],
+}
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+def _text_feature_matrix(text_features: Optional[List[Optional[dict]]], n: int) -> np.ndarray:
+    """Pack per-case text features into an (n, 9) float matrix (zeros when absent)."""
+    mat = np.zeros((n, len(TEXT_FEATURES)), dtype=np.float64)
+    if text_features is None:
+        return mat
+    for i, features in enumerate(text_features):
+        if features and features.get("confidence", 0) > 0:
+            mat[i] = [float(features.get(name, 0.0)) for name in TEXT_FEATURES]
+    return mat
+
+
+def _case_arrays(
+    cases: List[CaseData],
+    text_features: Optional[List[Optional[dict]]],
+    columns: Optional[Dict[str, np.ndarray]] = None
+) -> tuple:
+    """
+    Unpack a list of cases into one array per field (or use the given columns).
+    
+    The last element is the text feature matrix, or None when
+    text_features is None so the no-text path doesn't allocate it.
+    """
+    n = len(cases)
+    text_feat_mat = None if text_features is None else _text_feature_matrix(text_features, n)
+    if columns is not None:
+        return (
+            columns['order_value'],
+            columns['delivery_delay_min'],
+            columns['restaurant_error_rate'],
+            columns['customer_refund_rate'],
+            columns['photo_provided'],
+            columns['complaint_type'],
+            text_feat_mat,
+        )
+    return (
+        np.fromiter((c.order_value for c in cases), dtype=np.float64, count=n),
+        np.fromiter((c.delivery_delay_min for c in cases), dtype=np.int64, count=n),
+        np.fromiter((c.restaurant_error_rate for c in cases), dtype=np.float64, count=n),
+        np.fromiter((c.customer_refund_rate for c in cases), dtype=np.float64, count=n),
+        np.fromiter((c.photo_provided for c in cases), dtype=bool, count=n),
+        np.fromiter((_CT_INDEX[c.complaint_type] for c in cases), dtype=np.int8, count=n),
+        text_feat_mat,
+    )
+
+
+def _score_arrays(order_value, delay, rest_err, cust_ref, photo, ctype_idx, text_feat_mat=None) -> np.ndarray:
+    """Vectorized NumPy scoring of the unpacked case arrays (no text columns when text_feat_mat is None)."""
+    out = np.empty((len(order_value), _N_COLUMNS), dtype=np.float64)
+    out[:, 1] = SEVERITY_LUT[ctype_idx]
+    out[:, 2] = DELAY_SCORES[np.searchsorted(DELAY_BINS, delay, side='right')]
+    out[:, 3] = RESTAURANT_SCORES[np.searchsorted(RESTAURANT_BINS, rest_err, side='right')]
+    out[:, 4] = CUSTOMER_SCORES[np.searchsorted(CUSTOMER_BINS, cust_ref, side='right')]
+    out[:, 5] = np.where(photo, 10, -5)
+    out[:, 6] = VALUE_SCORES[np.searchsorted(VALUE_BINS, order_value, side='right')]
+    if text_feat_mat is None:
+        out[:, 7:] = 0
+        out[:, 0] = out[:, 1:7].sum(axis=1)
+        return out
+    
+    t = text_feat_mat
+    out[:, 7] = -8 * (t[:, 6] > 0)
+    out[:, 8] = (
+        8 * (t[:, 3] > 0)
+        + 12 * ((t[:, 1] > 0) | (t[:, 2] > 0))
+        + 10 * (t[:, 5] > 0)
+        + 7 * (t[:, 0] > 0)
+        + 6 * (t[:, 4] > 0)
+        - 5 * (t[:, 7] > 0.7)
+        + 8 * (t[:, 8] > 0.6)
+    )
+    out[:, 0] = out[:, 1:].sum(axis=1)
+    return out
+
+
+def _decide_arrays(rule_scores, weights, enabled, thresholds) -> tuple:
+    """
+    Vectorized weighted scoring and thresholding of score_cases_batch output.
+    
+    Args:
+        rule_scores: Output of score_cases_batch (column 0 is ignored)
+        weights: Weight per rule in RULE_CODES order
+        enabled: Boolean mask per rule in RULE_CODES order
+        thresholds: (refund, review high, partial, review low) score cut-offs
+        
+    Returns:
+        Tuple of (scores, index into _ACTIONS) arrays
+    """
+    refund, review_high, partial, review_low = thresholds
+    scores = rule_scores[:, 1:] @ np.where(enabled, weights, 0.0)
+    decisions = np.select(
+        [scores >= refund, scores >= review_high, scores >= partial, scores >= review_low],
+        [0, 1, 2, 1],
+        default=3
+    ).astype(np.int8)
+    return scores, decisions
+
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True, inline='always')
+    def _rule_row(order_value, delay, rest_err, cust_ref, photo, ctype_idx):
+        """Compiled scores of the six case-field rules for one row."""
+        severity = SEVERITY_LUT[ctype_idx]
+        d = DELAY_SCORES[np.searchsorted(DELAY_BINS, delay, side='right')]
+        r = RESTAURANT_SCORES[np.searchsorted(RESTAURANT_BINS, rest_err, side='right')]
+        c = CUSTOMER_SCORES[np.searchsorted(CUSTOMER_BINS, cust_ref, side='right')]
+        e = 10.0 if photo else -5.0
+        v = VALUE_SCORES[np.searchsorted(VALUE_BINS, order_value, side='right')]
+        return severity, d, r, c, e, v
+    
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _score_kernel(order_value, delay, rest_err, cust_ref, photo, ctype_idx, text_feat_mat):
+        """Compiled per-row scoring; same output layout as _score_arrays."""
+        n = order_value.shape[0]
+        out = np.empty((n, _N_COLUMNS), dtype=np.float64)
+        for i in range(n):
+            severity, d, r, c, e, v = _rule_row(
+                order_value[i], delay[i], rest_err[i], cust_ref[i], photo[i], ctype_idx[i]
+            )
+            
+            vg = -8.0 if text_feat_mat[i, 6] > 0 else 0.0
+            
+            t = 0.0
+            if text_feat_mat[i, 3] > 0:
+                t += 8.0
+            if text_feat_mat[i, 1] > 0 or text_feat_mat[i, 2] > 0:
+                t += 12.0
+            if text_feat_mat[i, 5] > 0:
+                t += 10.0
+            if text_feat_mat[i, 0] > 0:
+                t += 7.0
+            if text_feat_mat[i, 4] > 0:
+                t += 6.0
+            if text_feat_mat[i, 7] > 0.7:
+                t -= 5.0
+            if text_feat_mat[i, 8] > 0.6:
+                t += 8.0
+            
+            out[i, 1] = severity
+            out[i, 2] = d
+            out[i, 3] = r
+            out[i, 4] = c
+            out[i, 5] = e
+            out[i, 6] = v
+            out[i, 7] = vg
+            out[i, 8] = t
+            out[i, 0] = severity + d + r + c + e + v + vg + t
+        return out
+    
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _score_kernel_no_text(order_value, delay, rest_err, cust_ref, photo, ctype_idx):
+        """_score_kernel for rows without text features; text columns are 0."""
+        n = order_value.shape[0]
+        out = np.empty((n, _N_COLUMNS), dtype=np.float64)
+        for i in range(n):
+            severity, d, r, c, e, v = _rule_row(
+                order_value[i], delay[i], rest_err[i], cust_ref[i], photo[i], ctype_idx[i]
+            )
+            out[i, 1] = severity
+            out[i, 2] = d
+            out[i, 3] = r
+            out[i, 4] = c
+            out[i, 5] = e
+            out[i, 6] = v
+            out[i, 7] = 0.0
+            out[i, 8] = 0.0
+            out[i, 0] = severity + d + r + c + e + v
+        return out
+    
+    @njit(cache=True, nogil=True, fastmath=True)
+    def _decide_kernel(rule_scores, weights, enabled, thresholds):
+        """Compiled per-row weighted sum and thresholding; same output as _decide_arrays."""
+        refund, review_high, partial, review_low = thresholds
+        n = rule_scores.shape[0]
+        scores = np.empty(n, dtype=np.float64)
+        decisions = np.empty(n, dtype=np.int8)
+        for i in range(n):
+            s = 0.0
+            for j in range(weights.shape[0]):
+                if enabled[j]:
+                    s += rule_scores[i, j + 1] * weights[j]
+            scores[i] = s
+            
+            if s >= refund:
+                decisions[i] = 0
+            elif s >= review_high:
+                decisions[i] = 1
+            elif s >= partial:
+                decisions[i] = 2
+            elif s >= review_low:
+                decisions[i] = 1
+            else:
+                decisions[i] = 3
+        return scores, decisions
+
+
+def warmup() -> None:
+    """
+    Compile (or load from the on-disk cache) the Numba kernels.
+    
+    Called at application startup so the first request doesn't pay for
+    JIT compilation. A no-op when numba is not installed.
+    """
+    if not _NUMBA_AVAILABLE:
+        return
+    arrays = _case_arrays([], [])
+    _score_kernel_no_text(*arrays[:-1])
+    rule_scores = _score_kernel(*arrays)
+    _decide_kernel(
+        rule_scores,
+        np.ones(len(RULE_CODES)),
+        np.ones(len(RULE_CODES), dtype=np.bool_),
+        (70.0, 65.0, 40.0, 45.0)
+    )
+
+
+def score_cases_batch_numba(
+    cases: List[CaseData],
+    text_features: Optional[List[Optional[dict]]] = None
+) -> np.ndarray:
+    """
+    Score many cases with the Numba-compiled kernel.
+    
+    Raises:
+        RuntimeError: If numba is not installed
+    """
+    if not _NUMBA_AVAILABLE:
+        raise RuntimeError("numba is not installed")
+    arrays = _case_arrays(cases, text_features)
+    if text_features is None:
+        return _score_kernel_no_text(*arrays[:-1])
+    return _score_kernel(*arrays)
+
+
+def score_cases_batch(
+    cases: List[CaseData],
+    text_features: Optional[List[Optional[dict]]] = None,
+    columns: Optional[Dict[str, np.ndarray]] = None
+) -> np.ndarray:
+    """
+    Score many cases at once with vectorized rule evaluation.
+    
+    The case list is unpacked into one array per field and each rule
+    is evaluated for all rows in a single pass. Uses the Numba kernel
+    when numba is installed, NumPy otherwise.
+    
+    Args:
+        cases: The cases to score
+        text_features: Optional text features per case (None for no text)
+        columns: Optional per-field arrays aligned with cases, as returned
+            by data.load_cases_and_columns; used instead of unpacking cases
+        
+    Returns:
+        Array of shape (len(cases), len(BATCH_COLUMNS)); column 0 holds
+        the summed score and the remaining columns hold each rule's score
+    """
+    arrays = _case_arrays(cases, text_features, columns)
+    if text_features is None:
+        # No text for any row: skip the text rules entirely
+        if _NUMBA_AVAILABLE:
+            return _score_kernel_no_text(*arrays[:-1])
+        return _score_arrays(*arrays[:-1])
+    if _NUMBA_AVAILABLE:
+        return _score_kernel(*arrays)
+    return _score_arrays(*arrays)
+
+
+def _reason(factor: str, explanation: str, impact: float) -> DecisionReason:
+    """Build a DecisionReason from trusted engine values without validation."""
+    return DecisionReason.model_construct(factor=factor, explanation=explanation, impact=float(impact))
+
+
+# Below this many rows, splitting work across workers costs more than it saves
+_MIN_PARALLEL_ROWS = 10_000
+
+
+def _gil_disabled() -> bool:
+    """True on a free-threaded CPython build running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def score_cases_parallel(
+    cases: List[CaseData],
+    text_features: Optional[List[Optional[dict]]] = None,
+    max_workers: Optional[int] = None
+) -> np.ndarray:
+    """
+    Score many cases using all CPU cores.
+    
+    The cases are split into one chunk per worker. Chunks are scored by
+    threads when numba is installed (the kernels release the GIL) or on
+    free-threaded Python, and by worker processes otherwise.
+    
+    Args:
+        cases: The cases to score
+        text_features: Optional text features per case (None for no text)
+        max_workers: Number of workers (defaults to os.cpu_count())
+        
+    Returns:
+        Same layout as score_cases_batch
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(cases) < _MIN_PARALLEL_ROWS:
+        return score_cases_batch(cases, text_features)
+    
+    bounds = np.linspace(0, len(cases), workers + 1).astype(int)
+    case_chunks = [cases[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    if text_features is None:
+        feature_chunks = [None] * workers
+    else:
+        feature_chunks = [text_features[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+    
+    executor_cls = ThreadPoolExecutor if _NUMBA_AVAILABLE or _gil_disabled() else ProcessPoolExecutor
+    with executor_cls(max_workers=workers) as pool:
+        return np.concatenate(list(pool.map(score_cases_batch, case_chunks, feature_chunks)))
+
+
+def score_case_batches(batches: Iterable[List[CaseData]]) -> Iterator[np.ndarray]:
+    """
+    Score a stream of case batches, e.g. from data.iter_cases_from_csv.
+    
+    The next batch is fetched on a background thread while the current
+    one is scored, so reading and scoring overlap.
+    
+    Args:
+        batches: Iterable of case lists
+        
+    Yields:
+        One score_cases_batch result per input batch
+    """
+    it = iter(batches)
+    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+        pending = prefetcher.submit(next, it, None)
+        while True:
+            batch = pending.result()
+            if batch is None:
+                return
+            pending = prefetcher.submit(next, it, None)
+            yield score_cases_batch(batch)
+
+
+# Actions indexed by the decisions from _decide_arrays / _decide_kernel
+_ACTIONS = (RefundAction.REFUND, RefundAction.MANUAL_REVIEW, RefundAction.PARTIAL, RefundAction.REJECT)
+
+
+def _policy_arrays(weights: Optional[np.ndarray], enabled: Optional[np.ndarray]) -> tuple:
+    """Rule weights and enabled mask as arrays, defaulting to all 1.0 / all enabled."""
+    if weights is None:
+        weights = np.ones(len(RULE_CODES))
+    if enabled is None:
+        enabled = np.ones(len(RULE_CODES), dtype=np.bool_)
+    return np.asarray(weights, dtype=np.float64), np.asarray(enabled, dtype=np.bool_)
+
+
+def _weight_reasons(reasons: List[DecisionReason], weights: np.ndarray) -> List[DecisionReason]:
+    """Scale each reason's impact by its rule weight, dropping disabled rules."""
+    weighted = []
+    for reason in reasons:
+        weight = weights[_FACTOR_RULE.get(reason.factor, RULE_INDEX["TEXT_SIGNALS"])]
+        if weight == 0:
+            continue
+        if weight != 1:
+            reason = _reason(reason.factor, reason.explanation, round(reason.impact * weight, 2))
+        weighted.append(reason)
+    return weighted
+
+
 class RefundDecisionEngine:
     """
     Rule-based scoring engine that evaluates refund cases.
@@ -26,55 +555,38 @@ class RefundDecisionEngine:
     MANUAL_REVIEW_THRESHOLD_HIGH = 65
     MANUAL_REVIEW_THRESHOLD_LOW = 45
     
-    def evaluate_case(self, case: CaseData, text_features: Optional[dict] = None) -> RefundSuggestion:
+    def evaluate_case(
+        self,
+        case: CaseData,
+        text_features: Optional[dict] = None,
+        reasons: bool = True
+    ) -> RefundSuggestion:
         """
         Evaluate a case and return a refund suggestion.
         
         Args:
             case: The case data to evaluate
             text_features: Optional text features extracted from complaint text
+            reasons: If False, skip building explanations (reasons=[])
             
         Returns:
             RefundSuggestion with action, confidence, score, and reasons
         """
-        reasons = []
-        score = 0.0
-        
-        # Rule 1: Complaint Severity
-        severity_score, severity_reason = self._evaluate_complaint_severity(case)
-        score += severity_score
-        reasons.append(severity_reason)
-        
-        # Rule 2: Delivery Delay
-        delay_score, delay_reason = self._evaluate_delivery_delay(case)
-        score += delay_score
-        reasons.append(delay_reason)
-        
-        # Rule 3: Restaurant Reliability
-        restaurant_score, restaurant_reason = self._evaluate_restaurant_error_rate(case)
-        score += restaurant_score
-        reasons.append(restaurant_reason)
-        
-        # Rule 4: Customer History
-        customer_score, customer_reason = self._evaluate_customer_history(case)
-        score += customer_score
-        reasons.append(customer_reason)
-        
-        # Rule 5: Evidence Quality
-        evidence_score, evidence_reason = self._evaluate_evidence(case)
-        score += evidence_score
-        reasons.append(evidence_reason)
-        
-        # Rule 6: Order Value
-        value_score, value_reason = self._evaluate_order_value(case)
-        score += value_score
-        reasons.append(value_reason)
+        score = float(_score_row(
+            case.order_value,
+            case.delivery_delay_min,
+            case.restaurant_error_rate,
+            case.customer_refund_rate,
+            case.photo_provided,
+            _CT_INDEX[case.complaint_type]
+        ))
+        explanations = self._rule_reasons(case) if reasons else []
         
         # Rule 7-13: Text Intelligence Features (if available)
         if text_features and text_features.get("confidence", 0) > 0:
-            text_score, text_reasons = self._evaluate_text_features(text_features)
+            text_score, text_reasons = self._evaluate_text_features(text_features, explain=reasons)
             score += text_score
-            reasons.extend(text_reasons)
+            explanations.extend(text_reasons)
         
         # Determine action and confidence
         action, confidence = self._score_to_action(score, case)
@@ -83,103 +595,196 @@ class RefundDecisionEngine:
             action=action,
             confidence=confidence,
             score=round(score, 2),
-            reasons=reasons
+            reasons=explanations
+        )
+    
+    def evaluate_batch(
+        self,
+        cases: List[CaseData],
+        text_features: Optional[List[Optional[dict]]] = None,
+        weights: Optional[np.ndarray] = None,
+        enabled: Optional[np.ndarray] = None,
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[RefundSuggestion]:
+        """
+        Evaluate many cases at once, applying policy rule weights.
+        
+        Rule contributions for all rows come from score_cases_batch; the
+        weighted scores and the actions are computed in one more pass
+        (compiled when numba is installed).
+        
+        Args:
+            cases: The cases to evaluate
+            text_features: Optional text features per case (None for no text)
+            weights: Weight per rule in RULE_CODES order (defaults to all 1.0)
+            enabled: Boolean mask per rule in RULE_CODES order (defaults to
+                all enabled)
+            columns: Optional per-field arrays aligned with cases (see
+                score_cases_batch)
+            
+        Returns:
+            One RefundSuggestion per case, in order
+        """
+        weights, enabled = _policy_arrays(weights, enabled)
+        scores, actions = self._decide(cases, text_features, weights, enabled, columns)
+        confidences = self._action_confidences(scores, actions)
+        
+        # Disabled rules contribute nothing and get no explanation
+        weights = np.where(enabled, weights, 0.0)
+        suggestions = []
+        for i, case in enumerate(cases):
+            reasons = self.explain_row(case, text_features[i] if text_features else None)
+            suggestions.append(RefundSuggestion.model_construct(
+                action=_ACTIONS[actions[i]],
+                confidence=float(confidences[i]),
+                score=round(float(scores[i]), 2),
+                reasons=_weight_reasons(reasons, weights)
+            ))
+        return suggestions
+    
+    def score_only_batch(
+        self,
+        cases: List[CaseData],
+        text_features: Optional[List[Optional[dict]]] = None,
+        weights: Optional[np.ndarray] = None,
+        enabled: Optional[np.ndarray] = None,
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ) -> np.ndarray:
+        """
+        Weighted scores only, as evaluate_batch would compute them.
+        
+        Skips building suggestions and explanations, for callers that
+        only need to rank or filter cases.
+        
+        Returns:
+            Score per case, in order
+        """
+        return self._decide(cases, text_features, weights, enabled, columns)[0]
+    
+    def _decide(
+        self,
+        cases: List[CaseData],
+        text_features: Optional[List[Optional[dict]]],
+        weights: Optional[np.ndarray],
+        enabled: Optional[np.ndarray],
+        columns: Optional[Dict[str, np.ndarray]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Weighted scores and action indices for a batch.
+        
+        Returns:
+            Tuple of (scores, index into _ACTIONS) arrays
+        """
+        weights, enabled = _policy_arrays(weights, enabled)
+        thresholds = (
+            float(self.REFUND_THRESHOLD),
+            float(self.MANUAL_REVIEW_THRESHOLD_HIGH),
+            float(self.PARTIAL_THRESHOLD),
+            float(self.MANUAL_REVIEW_THRESHOLD_LOW),
         )
+        decide = _decide_kernel if _NUMBA_AVAILABLE else _decide_arrays
+        return decide(score_cases_batch(cases, text_features, columns), weights, enabled, thresholds)
+    
+    def evaluate_batch_no_text(
+        self,
+        cases: List[CaseData],
+        weights: Optional[np.ndarray] = None,
+        enabled: Optional[np.ndarray] = None,
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[RefundSuggestion]:
+        """
+        evaluate_batch for cases known to have no text features.
+        
+        Uses the scoring kernel specialized for that case, which skips
+        the text rules instead of evaluating them against zeros.
+        
+        Args:
+            cases: The cases to evaluate
+            weights: Weight per rule in RULE_CODES order (defaults to all 1.0)
+            enabled: Boolean mask per rule in RULE_CODES order
+            columns: Optional per-field arrays aligned with cases
+            
+        Returns:
+            One RefundSuggestion per case, in order
+        """
+        return self.evaluate_batch(cases, None, weights, enabled, columns)
+    
+    def explain_row(self, case: CaseData, text_features: Optional[dict] = None) -> List[DecisionReason]:
+        """
+        Build the explanations for one case.
+        
+        Batch callers score every row with score_cases_batch and call this
+        only for the rows that are actually displayed.
+        
+        Args:
+            case: The case data to explain
+            text_features: Optional text features extracted from complaint text
+            
+        Returns:
+            One DecisionReason per rule that contributed to the score
+        """
+        reasons = self._rule_reasons(case)
+        
+        # Rule 7-13: Text Intelligence Features (if available)
+        if text_features and text_features.get("confidence", 0) > 0:
+            reasons.extend(self._evaluate_text_features(text_features)[1])
+        
+        return reasons
+    
+    def _rule_reasons(self, case: CaseData) -> List[DecisionReason]:
+        """Build the explanations for the six structured rules (1-6)."""
+        return [
+            self._evaluate_complaint_severity(case)[1],
+            self._evaluate_delivery_delay(case)[1],
+            self._evaluate_restaurant_error_rate(case)[1],
+            self._evaluate_customer_history(case)[1],
+            self._evaluate_evidence(case)[1],
+            self._evaluate_order_value(case)[1],
+        ]
     
     def _evaluate_complaint_severity(self, case: CaseData) -> tuple[float, DecisionReason]:
         """Evaluate complaint type severity."""
-        severity_map = {
-            ComplaintType.NEVER_ARRIVED: 35,
-            ComplaintType.DAMAGED_FOOD: 25,
-            ComplaintType.WRONG_ORDER: 20,
-            ComplaintType.MISSING_ITEMS: 18,
-            ComplaintType.QUALITY_ISSUE: 15,
-            ComplaintType.LATE_DELIVERY: 10,
-        }
-        
-        score = severity_map.get(case.complaint_type, 10)
-        
-        explanations = {
-            ComplaintType.NEVER_ARRIVED: "Order never arrived - critical issue",
-            ComplaintType.DAMAGED_FOOD: "Food damaged - health and safety concern",
-            ComplaintType.WRONG_ORDER: "Wrong order delivered - clear mistake",
-            ComplaintType.MISSING_ITEMS: "Items missing from order",
-            ComplaintType.QUALITY_ISSUE: "Quality concern reported",
-            ComplaintType.LATE_DELIVERY: "Delivery was late",
-        }
-        
-        return score, DecisionReason(
+        score = _SEVERITY_SCORE.get(case.complaint_type, 10)
+        
+        return score, _reason(
             factor="Complaint Severity",
-            explanation=explanations.get(case.complaint_type, "Unknown complaint"),
+            explanation=_SEVERITY_EXPLAIN.get(case.complaint_type, "Unknown complaint"),
             impact=score
         )
     
     def _evaluate_delivery_delay(self, case: CaseData) -> tuple[float, DecisionReason]:
         """Evaluate delivery delay impact."""
         delay = case.delivery_delay_min
+        idx = bisect_right(_DELAY_THR, delay)
+        score = _DELAY_SCORES[idx]
         
-        if delay >= 60:
-            score = 20
-            explanation = f"Severe delay ({delay} min) - highly unacceptable"
-        elif delay >= 30:
-            score = 12
-            explanation = f"Significant delay ({delay} min) - customer inconvenienced"
-        elif delay >= 15:
-            score = 5
-            explanation = f"Moderate delay ({delay} min) - minor inconvenience"
-        else:
-            score = 0
-            explanation = f"Minimal delay ({delay} min) - within acceptable range"
-        
-        return score, DecisionReason(
+        return score, _reason(
             factor="Delivery Delay",
-            explanation=explanation,
+            explanation=_DELAY_EXPLAIN[idx].format(delay),
             impact=score
         )
     
     def _evaluate_restaurant_error_rate(self, case: CaseData) -> tuple[float, DecisionReason]:
         """Evaluate restaurant's error rate."""
         rate = case.restaurant_error_rate
+        idx = bisect_right(_RE_THR, rate)
+        score = _RE_SCORES[idx]
         
-        if rate >= 0.3:
-            score = 15
-            explanation = f"High restaurant error rate ({rate:.0%}) - pattern of issues"
-        elif rate >= 0.15:
-            score = 8
-            explanation = f"Moderate restaurant error rate ({rate:.0%})"
-        elif rate >= 0.05:
-            score = 3
-            explanation = f"Low restaurant error rate ({rate:.0%})"
-        else:
-            score = 0
-            explanation = f"Excellent restaurant record ({rate:.0%})"
-        
-        return score, DecisionReason(
+        return score, _reason(
             factor="Restaurant Reliability",
-            explanation=explanation,
+            explanation=_RE_EXPLAIN[idx].format(rate),
             impact=score
         )
     
     def _evaluate_customer_history(self, case: CaseData) -> tuple[float, DecisionReason]:
         """Evaluate customer's refund history."""
         rate = case.customer_refund_rate
+        idx = bisect_right(_CUST_THR, rate)
+        score = _CUST_SCORES[idx]
         
-        if rate >= 0.4:
-            score = -15
-            explanation = f"High customer refund rate ({rate:.0%}) - possible abuse pattern"
-        elif rate >= 0.2:
-            score = -8
-            explanation = f"Elevated customer refund rate ({rate:.0%}) - requires scrutiny"
-        elif rate >= 0.1:
-            score = -3
-            explanation = f"Moderate customer refund rate ({rate:.0%})"
-        else:
-            score = 5
-            explanation = f"Excellent customer history ({rate:.0%}) - trustworthy"
-        
-        return score, DecisionReason(
+        return score, _reason(
             factor="Customer History",
-            explanation=explanation,
+            explanation=_CUST_EXPLAIN[idx].format(rate),
             impact=score
         )
     
@@ -192,7 +797,7 @@ class RefundDecisionEngine:
             score = -5
             explanation = "No photo evidence - claim unverified"
         
-        return score, DecisionReason(
+        return score, _reason(
             factor="Evidence Quality",
             explanation=explanation,
             impact=score
@@ -201,32 +806,26 @@ class RefundDecisionEngine:
     def _evaluate_order_value(self, case: CaseData) -> tuple[float, DecisionReason]:
         """Evaluate order value impact."""
         value = case.order_value
+        idx = bisect_right(_VALUE_THR, value)
+        score = _VALUE_SCORES[idx]
         
-        if value >= 100:
-            score = 10
-            explanation = f"High-value order (${value:.2f}) - important customer"
-        elif value >= 50:
-            score = 5
-            explanation = f"Medium-value order (${value:.2f})"
-        elif value >= 20:
-            score = 2
-            explanation = f"Standard order value (${value:.2f})"
-        else:
-            score = 0
-            explanation = f"Low-value order (${value:.2f})"
-        
-        return score, DecisionReason(
+        return score, _reason(
             factor="Order Value",
-            explanation=explanation,
+            explanation=_VALUE_EXPLAIN[idx].format(value),
             impact=score
         )
     
-    def _evaluate_text_features(self, features: dict) -> tuple[float, List[DecisionReason]]:
+    def _evaluate_text_features(
+        self,
+        features: dict,
+        explain: bool = True
+    ) -> tuple[float, List[DecisionReason]]:
         """
         Evaluate text intelligence features extracted by LLM.
         
         Args:
             features: Dictionary of text features from NLP extraction
+            explain: If False, only the score is computed (no reasons are built)
             
         Returns:
             Tuple of (total_score, list_of_reasons)
@@ -238,87 +837,117 @@ class RefundDecisionEngine:
         if features.get("temperature_problem", False):
             score = 8
             total_score += score
-            reasons.append(DecisionReason(
-                factor="TEXT_SIGNAL_Temperature",
-                explanation="Complaint mentions temperature issues - food quality concern",
-                impact=score
-            ))
+            if explain:
+                reasons.append(_reason(
+                    factor="TEXT_SIGNAL_Temperature",
+                    explanation="Complaint mentions temperature issues - food quality concern",
+                    impact=score
+                ))
         
         # Missing or wrong item - strong validity
         if features.get("missing_item", False) or features.get("wrong_item", False):
             score = 12
             total_score += score
-            item_type = "missing" if features.get("missing_item") else "wrong"
-            reasons.append(DecisionReason(
-                factor="TEXT_SIGNAL_ItemIssue",
-                explanation=f"Complaint clearly describes {item_type} item - strong validity",
-                impact=score
-            ))
+            if explain:
+                item_type = "missing" if features.get("missing_item") else "wrong"
+                reasons.append(_reason(
+                    factor="TEXT_SIGNAL_ItemIssue",
+                    explanation=f"Complaint clearly describes {item_type} item - strong validity",
+                    impact=score
+                ))
         
         # Delivery spill - courier fault
         if features.get("delivery_spill", False):
             score = 10
             total_score += score
-            reasons.append(DecisionReason(
-                factor="TEXT_SIGNAL_DeliverySpill",
-                explanation="Delivery spill mentioned - courier fault, not restaurant",
-                impact=score
-            ))
+            if explain:
+                reasons.append(_reason(
+                    factor="TEXT_SIGNAL_DeliverySpill",
+                    explanation="Delivery spill mentioned - courier fault, not restaurant",
+                    impact=score
+                ))
         
         # Food quality issue
         if features.get("food_quality_issue", False):
             score = 7
             total_score += score
-            reasons.append(DecisionReason(
-                factor="TEXT_SIGNAL_FoodQuality",
-                explanation="Food quality issue described in complaint",
-                impact=score
-            ))
+            if explain:
+                reasons.append(_reason(
+                    factor="TEXT_SIGNAL_FoodQuality",
+                    explanation="Food quality issue described in complaint",
+                    impact=score
+                ))
         
         # Packaging problem
         if features.get("packaging_problem", False):
             score = 6
             total_score += score
-            reasons.append(DecisionReason(
-                factor="TEXT_SIGNAL_Packaging",
-                explanation="Packaging problem mentioned - preparation issue",
-                impact=score
-            ))
+            if explain:
+                reasons.append(_reason(
+                    factor="TEXT_SIGNAL_Packaging",
+                    explanation="Packaging problem mentioned - preparation issue",
+                    impact=score
+                ))
         
         # Vague complaint - decreases validity
         if features.get("vague_complaint", False):
             score = -8
             total_score += score
-            reasons.append(DecisionReason(
-                factor="TEXT_SIGNAL_VagueComplaint",
-                explanation="Complaint is vague or lacks specifics - reduces credibility",
-                impact=score
-            ))
+            if explain:
+                reasons.append(_reason(
+                    factor="TEXT_SIGNAL_VagueComplaint",
+                    explanation="Complaint is vague or lacks specifics - reduces credibility",
+                    impact=score
+                ))
         
         # High customer aggression - slightly decrease
         aggression = features.get("customer_aggression", 0.0)
         if aggression > 0.7:
             score = -5
             total_score += score
-            reasons.append(DecisionReason(
-                factor="TEXT_SIGNAL_Aggression",
-                explanation=f"High aggression level ({aggression:.1%}) - may indicate unreasonable expectations",
-                impact=score
-            ))
+            if explain:
+                reasons.append(_reason(
+                    factor="TEXT_SIGNAL_Aggression",
+                    explanation=f"High aggression level ({aggression:.1%}) - may indicate unreasonable expectations",
+                    impact=score
+                ))
         
         # High evidence strength - increase validity
         evidence_strength = features.get("evidence_strength", 0.0)
         if evidence_strength > 0.6:
             score = 8
             total_score += score
-            reasons.append(DecisionReason(
-                factor="TEXT_SIGNAL_EvidenceStrength",
-                explanation=f"Strong evidence in complaint text ({evidence_strength:.1%}) - detailed description",
-                impact=score
-            ))
+            if explain:
+                reasons.append(_reason(
+                    factor="TEXT_SIGNAL_EvidenceStrength",
+                    explanation=f"Strong evidence in complaint text ({evidence_strength:.1%}) - detailed description",
+                    impact=score
+                ))
         
         return total_score, reasons
     
+    def _action_confidences(self, scores: np.ndarray, actions: np.ndarray) -> np.ndarray:
+        """
+        Vectorized confidence part of _score_to_action.
+        
+        Args:
+            scores: Computed scores
+            actions: Index into _ACTIONS per score
+            
+        Returns:
+            Confidence per score
+        """
+        normalized = np.clip((scores + 25) / 1.4, 0, 100)
+        return np.select(
+            [actions == 0, actions == 2, actions == 3],
+            [
+                np.minimum(0.95, normalized / 100),
+                np.minimum(0.85, normalized / 100),
+                np.minimum(0.90, (100 - normalized) / 100),
+            ],
+            default=0.6
+        )
+    
     def _score_to_action(self, score: float, case: CaseData) -> tuple[RefundAction, float]:
         """
         Convert score to action and confidence.
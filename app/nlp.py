@@ -3,33 +3,245 @@ Text intelligence layer for extracting structured features from complaint text.
 Uses OpenAI to convert unstructured text into structured signals for the rule engine.
 """
 import os
-import json
-import hashlib
-from typing import Dict, Optional
-from openai import OpenAI, OpenAIError
-import time
+import re
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI, OpenAIError
 
+# Fast JSON parsing/serialization when orjson is installed
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
-# In-memory cache for extracted features
-_feature_cache: Dict[str, dict] = {}
+# Multi-pattern keyword matching in one pass when hyperscan is installed
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Non-cryptographic hash for cache keys: xxh3 when installed, else BLAKE2b
+try:
+    from xxhash import xxh3_64_hexdigest as _hash
+except ImportError:
+    import hashlib
+    
+    def _hash(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# Bounded in-memory LRU cache for extracted features
+_CACHE_MAXSIZE = 10_000
+_feature_cache: "OrderedDict[str, dict]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# On-disk cache so extractions survive restarts (empty NLP_CACHE_PATH disables it)
+_DISK_CACHE_PATH = os.getenv("NLP_CACHE_PATH", ".nlp_cache")
+_disk: Optional[sqlite3.Connection] = None
+
+# Concurrent OpenAI requests per batch, and complaints per packed request
+_MAX_CONCURRENCY = 16
+_PACK_SIZE = 10
+
+_REQUIRED_FIELDS = [
+    "food_quality_issue", "missing_item", "wrong_item",
+    "temperature_problem", "packaging_problem", "delivery_spill",
+    "vague_complaint", "customer_aggression", "evidence_strength",
+    "confidence"
+]
+_BOOL_FIELDS = _REQUIRED_FIELDS[:7]
+
+_SYSTEM_PROMPT = (
+    "Extract structured signals from a food delivery complaint as a JSON object with fields "
+    "food_quality_issue, missing_item, wrong_item, temperature_problem, packaging_problem, "
+    "delivery_spill, vague_complaint (booleans) and customer_aggression, evidence_strength, "
+    "confidence (floats 0-1). Do not decide refund outcomes."
+)
+
+
+# Keyword patterns for the local pre-pass that can skip the LLM call
+_PATTERNS = {
+    "food_quality_issue": re.compile(
+        r"\b(stale|raw|undercooked|overcooked|soggy|rotten|spoil(ed|t)|mou?ldy|inedible|"
+        r"tasted? (bad|off|awful|terrible)|hair in|bug in)\b", re.I),
+    "missing_item": re.compile(
+        r"\b(missing|didn'?t (get|receive)|never (got|received)|forgot|left out|"
+        r"wasn'?t (in|included))\b", re.I),
+    "wrong_item": re.compile(
+        r"\b(wrong|incorrect|not what i ordered|someone else'?s|different (order|item|dish))\b", re.I),
+    "temperature_problem": re.compile(
+        r"\b(cold|lukewarm|luke warm|tepid|frozen|burnt|burned|not (hot|warm))\b", re.I),
+    "packaging_problem": re.compile(
+        r"\b(packag(e|ing)|container|lid|(seal|bag|box) (was )?(broken|open|torn|ripped))\b", re.I),
+    "delivery_spill": re.compile(
+        r"\b(spill(ed|t)?|leak(ed|ing)?|soaked|dropped|crushed|all over the bag)\b", re.I),
+}
+_AGGRESSION = re.compile(
+    r"\b(ridiculous|unacceptable|worst|scam|pathetic|useless|idiots?|never order(ing)? again|"
+    r"sue|lawyer)\b|!{2,}", re.I)
+_EVIDENCE = re.compile(r"\b(photo|picture|pic|image|attached|receipt)\b", re.I)
+# A negation up to three words before a keyword ("nothing was missing",
+# "no complaints about the packaging") makes the match ambiguous
+_NEGATED = re.compile(
+    r"\b(no|not|nothing|none|never|without|(is|was|were|did|does|do)n'?t)\W+(\w+\W+){0,3}?(%s)"
+    % "|".join(pattern.pattern for pattern in _PATTERNS.values()), re.I)
+
+
+
+def _compile_pattern_db() -> Optional["hyperscan.Database"]:
+    """Compile _PATTERNS into one hyperscan database, or None to use re."""
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    try:
+        db.compile(
+            expressions=[pattern.pattern.encode("utf-8") for pattern in _PATTERNS.values()],
+            ids=list(range(len(_PATTERNS))),
+            elements=len(_PATTERNS),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_CASELESS] * len(_PATTERNS)
+        )
+    except hyperscan.error as e:
+        print(f"hyperscan compile failed, using re: {e}")
+        return None
+    return db
+
+
+_PATTERN_DB = _compile_pattern_db()
+# hyperscan scratch space may not be shared between threads
+_scratch = threading.local()
+
+
+def _match_patterns(text: str) -> dict:
+    """Which _PATTERNS occur in text: one hyperscan pass when available, else one re search each."""
+    # hyperscan's \b is ASCII-only, so non-ASCII text goes through re to
+    # keep Unicode word boundaries
+    if _PATTERN_DB is None or not text.isascii():
+        return {name: bool(pattern.search(text)) for name, pattern in _PATTERNS.items()}
+    
+    scratch = getattr(_scratch, "value", None)
+    if scratch is None:
+        scratch = _scratch.value = hyperscan.Scratch(_PATTERN_DB)
+    
+    hits = 0
+    
+    def on_match(pattern_id, start, end, flags, context):
+        nonlocal hits
+        hits |= 1 << pattern_id
+    
+    _PATTERN_DB.scan(text.encode("utf-8"), match_event_handler=on_match, scratch=scratch)
+    return {name: bool(hits >> i & 1) for i, name in enumerate(_PATTERNS)}
 
-# OpenAI client (initialized lazily)
-_client: Optional[OpenAI] = None
 
+# Minimum quick_extract confidence to use its features without an API key
+_QUICK_CONFIDENCE = 0.6
 
-def _get_client() -> Optional[OpenAI]:
-    """Get or create OpenAI client."""
-    global _client
-    if _client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            _client = OpenAI(api_key=api_key)
-    return _client
+
+def quick_extract(text: str) -> dict:
+    """
+    Extract features with local keyword patterns, without calling the LLM.
+    
+    Confidence is high only for an unambiguous match: at least two
+    concrete issues and no negation near a keyword. A single keyword
+    ("took the wrong turn") or a negated one ("nothing was missing")
+    gets a low confidence.
+    
+    Args:
+        text: Customer complaint text
+    
+    Returns:
+        Feature dictionary with the same fields as extract_text_features
+    """
+    features = _match_patterns(text)
+    signals = sum(features.values())
+    
+    features["vague_complaint"] = signals == 0
+    features["customer_aggression"] = round(min(1.0, 0.35 * len(_AGGRESSION.findall(text))), 2)
+    features["evidence_strength"] = round(min(1.0, 0.3 * signals + 0.2 * len(_EVIDENCE.findall(text))), 2)
+    features["confidence"] = 0.8 if signals >= 2 and not _NEGATED.search(text) else 0.3
+    return features
+
+
+def _get_async_client(http_client: Optional[httpx.AsyncClient] = None) -> Optional[AsyncOpenAI]:
+    """
+    Create an async OpenAI client.
+    
+    Without http_client the client (and its connection pool) is scoped to
+    one batch run, since sync batches each run in their own event loop.
+    With http_client the caller's pooled connections are reused.
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if api_key:
+        return AsyncOpenAI(api_key=api_key, http_client=http_client)
+    return None
 
 
 def _get_cache_key(text: str) -> str:
     """Generate cache key from text."""
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
+    return _hash(text.encode('utf-8'))
+
+
+def _get_disk() -> Optional[sqlite3.Connection]:
+    """Get or create the on-disk cache connection (caller holds _cache_lock)."""
+    global _disk
+    if _disk is None and _DISK_CACHE_PATH:
+        _disk = sqlite3.connect(_DISK_CACHE_PATH, check_same_thread=False)
+        _disk.execute(
+            "CREATE TABLE IF NOT EXISTS features (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+    return _disk
+
+
+def _remember(cache_key: str, features: dict) -> None:
+    """Insert into the in-memory LRU, evicting the oldest entry when full."""
+    _feature_cache[cache_key] = features
+    _feature_cache.move_to_end(cache_key)
+    if len(_feature_cache) > _CACHE_MAXSIZE:
+        _feature_cache.popitem(last=False)
+
+
+def _cache_get(cache_key: str) -> Optional[dict]:
+    """Look up features in memory, then on disk."""
+    with _cache_lock:
+        features = _feature_cache.get(cache_key)
+        if features is not None:
+            _feature_cache.move_to_end(cache_key)
+            return features
+        
+        try:
+            disk = _get_disk()
+            row = disk.execute(
+                "SELECT value FROM features WHERE key = ?", (cache_key,)
+            ).fetchone() if disk else None
+        except sqlite3.Error as e:
+            print(f"NLP disk cache read failed: {e}")
+            return None
+        
+        if row is None:
+            return None
+        features = _json.loads(row[0])
+        _remember(cache_key, features)
+        return features
+
+
+def _cache_put(cache_key: str, features: dict) -> None:
+    """Store features in memory and on disk."""
+    with _cache_lock:
+        _remember(cache_key, features)
+        try:
+            disk = _get_disk()
+            if disk:
+                with disk:
+                    disk.execute(
+                        "INSERT OR REPLACE INTO features (key, value) VALUES (?, ?)",
+                        (cache_key, _json.dumps(features))
+                    )
+        except sqlite3.Error as e:
+            print(f"NLP disk cache write failed: {e}")
 
 
 def _get_fallback_features() -> dict:
@@ -48,6 +260,242 @@ def _get_fallback_features() -> dict:
     }
 
 
+def _parse_features(features) -> dict:
+    """
+    Validate an extracted feature dict and clamp its floats to 0-1.
+    
+    Raises:
+        ValueError: If the model output is not an object with every
+            field, a boolean field is not true/false (or 0/1), or a float
+            field is not numeric
+    """
+    if not isinstance(features, dict):
+        raise ValueError(f"Expected a JSON object, got {type(features).__name__}")
+    for field in _REQUIRED_FIELDS:
+        if field not in features:
+            raise ValueError(f"Missing field: {field}")
+    
+    # bool("false") is True, so only accept real booleans
+    for field in _BOOL_FIELDS:
+        value = features[field]
+        if not isinstance(value, (bool, int)) or value not in (0, 1):
+            raise ValueError(f"Field {field} is not a boolean: {value!r}")
+        features[field] = bool(value)
+    
+    # Ensure floats are in 0-1 range
+    for field in ["customer_aggression", "evidence_strength", "confidence"]:
+        try:
+            value = float(features[field])
+        except (TypeError, ValueError):
+            raise ValueError(f"Field {field} is not a number: {features[field]!r}")
+        features[field] = max(0.0, min(1.0, value))
+    
+    return features
+
+
+async def _extract_one(client: AsyncOpenAI, text: str) -> Optional[dict]:
+    """Extract features for one complaint; None if the call fails."""
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": text}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.0,
+            max_tokens=120,
+            timeout=4.0
+        )
+        return _parse_features(_json.loads(response.choices[0].message.content or ""))
+    
+    except (OpenAIError, _json.JSONDecodeError, ValueError) as e:
+        print(f"LLM extraction failed: {e}")
+        return None
+
+
+async def _extract_packed(client: AsyncOpenAI, texts: List[str]) -> List[Optional[dict]]:
+    """Extract features for several complaints in a single request."""
+    numbered = "\n\n".join(f"{i + 1}. {text}" for i, text in enumerate(texts))
+    user_prompt = (
+        f'Return {{"results": [...]}} with one object per complaint, in order.\n\n{numbered}'
+    )
+    
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.0,
+            max_tokens=120 * len(texts),
+            timeout=4.0 * len(texts)
+        )
+        payload = _json.loads(response.choices[0].message.content or "")
+        results = payload.get("results") if isinstance(payload, dict) else None
+        if not isinstance(results, list) or len(results) != len(texts):
+            raise ValueError(f"Expected a list of {len(texts)} results")
+    
+    except (OpenAIError, _json.JSONDecodeError, ValueError) as e:
+        print(f"LLM batch extraction failed: {e}")
+        return [None] * len(texts)
+    
+    # A malformed item only costs its own complaint
+    parsed = []
+    for features in results:
+        try:
+            parsed.append(_parse_features(features))
+        except ValueError as e:
+            print(f"LLM batch extraction failed for one complaint: {e}")
+            parsed.append(None)
+    return parsed
+
+
+async def _extract_many(
+    texts: List[str],
+    packed: bool,
+    http_client: Optional[httpx.AsyncClient] = None
+) -> List[Optional[dict]]:
+    """Run extractions concurrently, at most _MAX_CONCURRENCY in flight."""
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+    
+    async def limited(coro):
+        async with semaphore:
+            return await coro
+    
+    async def run(client: AsyncOpenAI) -> List[Optional[dict]]:
+        if packed:
+            chunks = [texts[i:i + _PACK_SIZE] for i in range(0, len(texts), _PACK_SIZE)]
+            results = await asyncio.gather(*[limited(_extract_packed(client, chunk)) for chunk in chunks])
+            return [features for chunk in results for features in chunk]
+        
+        return await asyncio.gather(*[limited(_extract_one(client, text)) for text in texts])
+    
+    if http_client is not None:
+        # The caller owns the pooled connections; don't close them here
+        return await run(_get_async_client(http_client))
+    
+    async with _get_async_client() as client:
+        return await run(client)
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion, even when called from inside an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def _split_cached(texts: List[str]) -> Tuple[List[str], Dict[str, dict], Dict[str, str]]:
+    """
+    Resolve texts from cache where possible.
+    
+    Returns:
+        (cache key per text, features found so far by key,
+        texts still needing extraction by key)
+    """
+    keys = [_get_cache_key(text) for text in texts]
+    found = {}
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key in found or key in pending:
+            continue
+        cached = _cache_get(key)
+        if cached is not None:
+            found[key] = cached
+        else:
+            pending[key] = text
+    
+    return keys, found, pending
+
+
+def _keyword_features(pending: Dict[str, str]) -> List[Optional[dict]]:
+    """No-key results: quick_extract features for unambiguous texts, None for the rest."""
+    results = []
+    for text in pending.values():
+        quick = quick_extract(text)
+        results.append(quick if quick["confidence"] >= _QUICK_CONFIDENCE else None)
+    return results
+
+
+def _collect(keys: List[str], found: Dict[str, dict], pending: Dict[str, str],
+             results: List[Optional[dict]], cache: bool = True) -> List[dict]:
+    """Cache results (if cache) and return one feature dict per key, in order."""
+    for key, features in zip(pending, results):
+        if features is not None:
+            if cache:
+                _cache_put(key, features)
+            found[key] = features
+    
+    return [found.get(key) or _get_fallback_features() for key in keys]
+
+
+async def extract_text_features_batch_async(
+    texts: List[str],
+    packed: bool = False,
+    http_client: Optional[httpx.AsyncClient] = None
+) -> List[dict]:
+    """
+    Awaitable version of extract_text_features_batch.
+    
+    The OpenAI calls run on the caller's event loop instead of a
+    private one, so async endpoints are not blocked while they wait.
+    The cache lookups and writes (which take _cache_lock and may touch
+    SQLite) run in a worker thread.
+    
+    Args:
+        texts: Customer complaint texts
+        packed: If True, send several complaints per OpenAI request
+        http_client: Optional shared client whose keep-alive connections
+            are reused across calls (must belong to the running loop)
+    
+    Returns:
+        One feature dictionary per input text, in order
+    """
+    keys, found, pending = await asyncio.to_thread(_split_cached, texts)
+    if not pending:
+        return _collect(keys, found, pending, [])
+    
+    if not os.getenv("OPENAI_API_KEY"):
+        return _collect(keys, found, pending, _keyword_features(pending), cache=False)
+    
+    results = await _extract_many(list(pending.values()), packed, http_client)
+    return await asyncio.to_thread(_collect, keys, found, pending, results)
+
+
+def extract_text_features_batch(texts: List[str], packed: bool = False) -> List[dict]:
+    """
+    Extract structured features for many complaint texts at once.
+    
+    Cached texts are served from cache, duplicates are extracted once,
+    and the remaining OpenAI calls run concurrently. Without an API key,
+    texts get quick_extract features when the keywords are unambiguous
+    and fallback features otherwise.
+    
+    Args:
+        texts: Customer complaint texts
+        packed: If True, send several complaints per OpenAI request
+    
+    Returns:
+        One feature dictionary per input text, in order
+        (see extract_text_features for the fields)
+    """
+    keys, found, pending = _split_cached(texts)
+    
+    # No API key configured - keyword features where clear, fallback
+    # otherwise; not cached, so they don't outlive a key being set
+    if pending and not os.getenv("OPENAI_API_KEY"):
+        return _collect(keys, found, pending, _keyword_features(pending), cache=False)
+    
+    results = _run_sync(_extract_many(list(pending.values()), packed)) if pending else []
+    return _collect(keys, found, pending, results)
+
+
 def extract_text_features(text: str) -> dict:
     """
     Extract structured features from complaint text using OpenAI.
@@ -57,7 +505,7 @@ def extract_text_features(text: str) -> dict:
     
     Args:
         text: Customer complaint text
-        
+    
     Returns:
         Dictionary with extracted features:
         - food_quality_issue: bool
@@ -71,90 +519,24 @@ def extract_text_features(text: str) -> dict:
         - evidence_strength: float (0-1)
         - confidence: float (0-1)
     """
-    # Check cache first
-    cache_key = _get_cache_key(text)
-    if cache_key in _feature_cache:
-        return _feature_cache[cache_key]
-    
-    # Get OpenAI client
-    client = _get_client()
-    if not client:
-        # No API key configured - return fallback
-        return _get_fallback_features()
-    
-    # Prepare prompts
-    system_prompt = """You are a structured information extractor for food delivery complaints.
-Return ONLY valid JSON.
-Do not explain anything.
-Do not add text outside JSON.
-You are not allowed to decide refund outcomes."""
-
-    user_prompt = f"""Complaint text:
-\"\"\"
-{text}
-\"\"\"
-
-Extract structured signals for operational decision support.
-
-Respond with JSON fields:
-food_quality_issue (boolean)
-missing_item (boolean)
-wrong_item (boolean)
-temperature_problem (boolean)
-packaging_problem (boolean)
-delivery_spill (boolean)
-vague_complaint (boolean)
-customer_aggression (0-1 float)
-evidence_strength (0-1 float)
-confidence (0-1 float)"""
+    return extract_text_features_batch([text])[0]
 
-    try:
-        # Call OpenAI with timeout
-        start_time = time.time()
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.0,
-            max_tokens=300,
-            timeout=4.0
-        )
-        
-        # Parse response
-        content = response.choices[0].message.content
-        features = json.loads(content)
-        
-        # Validate structure
-        required_fields = [
-            "food_quality_issue", "missing_item", "wrong_item",
-            "temperature_problem", "packaging_problem", "delivery_spill",
-            "vague_complaint", "customer_aggression", "evidence_strength",
-            "confidence"
-        ]
-        
-        for field in required_fields:
-            if field not in features:
-                raise ValueError(f"Missing field: {field}")
-        
-        # Ensure floats are in 0-1 range
-        for field in ["customer_aggression", "evidence_strength", "confidence"]:
-            features[field] = max(0.0, min(1.0, float(features[field])))
-        
-        # Cache the result
-        _feature_cache[cache_key] = features
-        
-        return features
-    
-    except (OpenAIError, json.JSONDecodeError, ValueError, KeyError, Exception) as e:
-        # Any error - return fallback
-        print(f"LLM extraction failed: {e}")
-        return _get_fallback_features()
+
+async def extract_text_features_async(text: str, http_client: Optional[httpx.AsyncClient] = None) -> dict:
+    """Awaitable version of extract_text_features (same fields; see
+    extract_text_features_batch_async for http_client)."""
+    return (await extract_text_features_batch_async([text], http_client=http_client))[0]
 
 
 def clear_cache():
-    """Clear the feature cache (useful for testing)."""
-    global _feature_cache
-    _feature_cache = {}
+    """Clear both feature cache tiers (useful for testing)."""
+    with _cache_lock:
+        _feature_cache.clear()
+        try:
+            disk = _get_disk()
+            if disk:
+                with disk:
+                    disk.execute("DELETE FROM features")
+        except sqlite3.Error as e:
+            print(f"NLP disk cache clear failed: {e}")
 
@@ -1,7 +1,7 @@
 """
 Data schemas for the refund decision system.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Literal, Optional
 from enum import Enum
 
@@ -26,6 +26,8 @@ class RefundAction(str, Enum):
 
 class CaseData(BaseModel):
     """Raw case data from CSV."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     case_id: str
     order_value: float
     delivery_delay_min: int
@@ -39,6 +41,8 @@ class CaseData(BaseModel):
 
 class DecisionReason(BaseModel):
     """Individual reason contributing to the decision."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     factor: str
     explanation: str
     impact: float = Field(description="Impact value on the decision score")
@@ -46,6 +50,8 @@ class DecisionReason(BaseModel):
 
 class RefundSuggestion(BaseModel):
     """Refund decision suggestion with explanation."""
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     action: RefundAction
     confidence: float = Field(ge=0, le=1)
     score: float
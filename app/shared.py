@@ -0,0 +1,186 @@
+"""
+Shared-memory copies of the loaded cases for multi-worker deployments.
+
+The parent process (see serve.py) parses the CSV and extracts the
+complaint text features once, then publishes everything a worker loads
+to shared memory: the numeric columns, the string columns and the text
+features. Workers attach read-only NumPy views and rebuild their case
+objects from them, without re-reading the CSV or calling the LLM.
+"""
+import json
+import os
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.data import _NUMERIC_COLUMNS
+from app.engine import _CT_INDEX, _case_arrays
+from app.nlp import _BOOL_FIELDS, _REQUIRED_FIELDS
+from app.schemas import CaseData
+
+# Environment variable carrying the published spec to workers
+ENV_VAR = "REFUND_SHARED_CASES"
+
+# Columns handed to the batch engine, in engine._case_arrays order
+_ENGINE_COLUMNS = (*_NUMERIC_COLUMNS, 'complaint_type')
+
+# complaint_type code -> ComplaintType
+_COMPLAINT_TYPES = list(_CT_INDEX)
+
+# Attached blocks; kept referenced so the views stay valid
+_attached: List[shared_memory.SharedMemory] = []
+
+
+def _pack_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode strings as concatenated UTF-8 bytes plus offsets (one more than strings)."""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Inverse of _pack_strings."""
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return [raw[a:b].decode('utf-8') for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _snapshot_arrays(
+    cases: List[CaseData],
+    text_features_by_id: Dict[str, dict],
+    columns: Optional[Dict[str, np.ndarray]]
+) -> Dict[str, np.ndarray]:
+    """Flatten the loaded cases into the arrays that get published."""
+    n = len(cases)
+    if columns is None:
+        # zip drops the text feature matrix, which is None here
+        columns = dict(zip(_ENGINE_COLUMNS, _case_arrays(cases, None)))
+    arrays = {name: np.ascontiguousarray(column) for name, column in columns.items()}
+    arrays['is_demo'] = np.fromiter((c.is_demo for c in cases), dtype=np.bool_, count=n)
+    
+    for name in ('case_id', 'complaint_text'):
+        data, offsets = _pack_strings([getattr(c, name) or "" for c in cases])
+        arrays[f'{name}_data'] = data
+        arrays[f'{name}_offsets'] = offsets
+    
+    has_features = np.zeros(n, dtype=np.bool_)
+    # One float row per case, booleans as 0/1
+    features = np.zeros((n, len(_REQUIRED_FIELDS)), dtype=np.float64)
+    for i, case in enumerate(cases):
+        f = text_features_by_id.get(case.case_id)
+        if f is not None:
+            has_features[i] = True
+            features[i] = [float(f.get(name, 0.0)) for name in _REQUIRED_FIELDS]
+    arrays['has_text_features'] = has_features
+    arrays['text_features'] = features
+    return arrays
+
+
+def publish_cases(
+    cases: List[CaseData],
+    text_features_by_id: Dict[str, dict],
+    columns: Optional[Dict[str, np.ndarray]],
+    path: str,
+    mtime: float
+) -> Tuple[List[shared_memory.SharedMemory], str]:
+    """
+    Copy the loaded cases into new shared memory blocks.
+    
+    Args:
+        cases: Cases loaded from the CSV
+        text_features_by_id: Text features per case_id, for cases with text
+        columns: Column arrays from data.load_cases_and_columns, or None
+            to build them from cases
+        path: CSV the cases were read from
+        mtime: Modification time of the CSV when it was read
+    
+    Returns:
+        (the created blocks, which the caller must release(), and the
+        JSON spec to pass to workers in ENV_VAR)
+    """
+    blocks = []
+    spec = {"path": os.path.abspath(path), "mtime": mtime, "arrays": {}}
+    for name, array in _snapshot_arrays(cases, text_features_by_id, columns).items():
+        # Zero-size blocks are not allowed
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        spec["arrays"][name] = [block.name, array.dtype.str, list(array.shape)]
+    return blocks, json.dumps(spec)
+
+
+def release(blocks: List[shared_memory.SharedMemory]) -> None:
+    """Close and remove blocks created by publish_cases."""
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+def attach_cases() -> Optional[dict]:
+    """
+    Attach to the cases published by the parent process, if any.
+    
+    Returns:
+        {"path", "mtime", "cases", "text_features_by_id", "columns"},
+        where columns are read-only views for the batch engine, or None
+        when ENV_VAR is not set
+    """
+    spec = os.getenv(ENV_VAR)
+    if not spec:
+        return None
+    spec = json.loads(spec)
+    
+    arrays = {}
+    for name, (block_name, dtype, shape) in spec["arrays"].items():
+        # Workers are spawned by the publishing process and share its
+        # resource tracker, so attaching doesn't hand ownership over
+        block = shared_memory.SharedMemory(name=block_name)
+        _attached.append(block)
+        array = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    
+    case_ids = _unpack_strings(arrays['case_id_data'], arrays['case_id_offsets'])
+    texts = _unpack_strings(arrays['complaint_text_data'], arrays['complaint_text_offsets'])
+    cases = [
+        CaseData.model_construct(
+            case_id=case_id,
+            order_value=order_value,
+            delivery_delay_min=delay,
+            restaurant_error_rate=rest_err,
+            customer_refund_rate=cust_ref,
+            complaint_type=_COMPLAINT_TYPES[ct],
+            photo_provided=photo,
+            is_demo=is_demo,
+            complaint_text=text or None
+        )
+        for case_id, order_value, delay, rest_err, cust_ref, ct, photo, is_demo, text in zip(
+            case_ids,
+            arrays['order_value'].tolist(),
+            arrays['delivery_delay_min'].tolist(),
+            arrays['restaurant_error_rate'].tolist(),
+            arrays['customer_refund_rate'].tolist(),
+            arrays['complaint_type'].tolist(),
+            arrays['photo_provided'].tolist(),
+            arrays['is_demo'].tolist(),
+            texts
+        )
+    ]
+    
+    text_features_by_id = {}
+    for i in np.flatnonzero(arrays['has_text_features']).tolist():
+        row = arrays['text_features'][i].tolist()
+        text_features_by_id[case_ids[i]] = {
+            name: bool(value) if name in _BOOL_FIELDS else value
+            for name, value in zip(_REQUIRED_FIELDS, row)
+        }
+    
+    return {
+        "path": spec["path"],
+        "mtime": spec["mtime"],
+        "cases": cases,
+        "text_features_by_id": text_features_by_id,
+        "columns": {name: arrays[name] for name in _ENGINE_COLUMNS},
+    }
@@ -1,16 +1,25 @@
 """
 Main FastAPI application for the refund decision system.
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List
+from fastapi.responses import JSONResponse, ORJSONResponse, Response, StreamingResponse
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 import os
-
-from app.schemas import HealthResponse, CaseWithSuggestion, TextFeaturesRequest, TextFeaturesResponse
-from app.data import load_cases_from_csv
-from app.engine import RefundDecisionEngine
-from app.nlp import extract_text_features
+import re
+import threading
+import time
+import httpx
+import numpy as np
+import orjson
+
+from app.schemas import CaseData, HealthResponse, CaseWithSuggestion, RefundSuggestion, TextFeaturesRequest, TextFeaturesResponse
+from app import shared
+from app.data import load_cases_and_columns
+from app.engine import RULE_CODES, RULE_INDEX, RefundDecisionEngine, warmup
+from app.nlp import extract_text_features_async, extract_text_features_batch
 from pydantic import BaseModel
 
 
@@ -18,7 +27,8 @@ from pydantic import BaseModel
 app = FastAPI(
     title="Refund Decision Engine",
     description="A rule-based system for evaluating food delivery refund requests",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware to allow cross-origin requests
@@ -35,14 +45,38 @@ default_origins = [
     "https://*.onrender.com",
 ]
 
+
+def _split_origins(origins: List[str]) -> Tuple[List[str], Optional[str]]:
+    """
+    Separate exact origins from wildcard ones such as "https://*.vercel.app".
+    
+    CORSMiddleware only compares allow_origins literally, so wildcard
+    entries are folded into a single allow_origin_regex (compiled once
+    by the middleware) where "*" matches one subdomain label.
+    
+    Returns:
+        (exact origins, regex for the wildcard origins or None)
+    """
+    exact = [origin for origin in origins if origin == "*" or "*" not in origin]
+    patterns = [
+        re.escape(origin).replace(r"\*", r"[^./]+")
+        for origin in origins
+        if origin != "*" and "*" in origin
+    ]
+    return exact, ("|".join(patterns) if patterns else None)
+
+
 if allowed_origins_str:
-    allowed_origins = allowed_origins_str.split(",")
+    allowed_origins = [origin.strip() for origin in allowed_origins_str.split(",") if origin.strip()]
 else:
     allowed_origins = ["*"]  # Allow all origins in development
 
+allowed_origins, allowed_origin_regex = _split_origins(allowed_origins)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
+    allow_origin_regex=allowed_origin_regex,
     allow_credentials=False,  # Must be False when using allow_origins=["*"]
     allow_methods=["*"],
     allow_headers=["*"],
@@ -54,18 +88,224 @@ engine = RefundDecisionEngine()
 # Data file path
 DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "cases.csv")
 
+
+# Cases published to shared memory by serve.py (None otherwise)
+_shared_cases: Optional[dict] = None
+
+# Serializes _load_cases_at, so concurrent cold calls parse the CSV and
+# run the text extraction once instead of once each
+_load_lock = threading.Lock()
+
+# Case_ids whose text extraction failed (fallback features) in the cached
+# load. They are kept out of the cache's lifetime: _load_cases retries
+# them at most every _RETRY_SECONDS and patches in what it recovers
+_RETRY_SECONDS = 30.0
+_failed_ids: List[str] = []
+_retry_at = 0.0
+
+# Bumped when a retry recovers text features; part of the /cases response cache key
+features_version = 0
+
+
+@lru_cache(maxsize=1)
+def _load_cases_at(
+    path: str,
+    mtime: Optional[float]
+) -> Tuple[List[CaseData], Dict[str, CaseData], Dict[str, dict], Optional[Dict[str, np.ndarray]]]:
+    """
+    Parse the cases CSV (cached per file mtime).
+    
+    Returns:
+        The cases, a case_id index, the text features of every case
+        that has complaint_text (extracted once per unique text), and
+        the numeric columns for the batch engine (None without pyarrow)
+    """
+    global _failed_ids, _retry_at
+    if (
+        _shared_cases is not None
+        and _shared_cases["path"] == os.path.abspath(path)
+        and _shared_cases["mtime"] == mtime
+    ):
+        # Parsed and text-extracted once by serve.py
+        cases = _shared_cases["cases"]
+        text_features_by_id = _shared_cases["text_features_by_id"]
+        columns = _shared_cases["columns"]
+    else:
+        cases, columns = load_cases_and_columns(path)
+        with_text = [case for case in cases if case.complaint_text]
+        features = extract_text_features_batch([case.complaint_text for case in with_text])
+        text_features_by_id = {case.case_id: f for case, f in zip(with_text, features)}
+    
+    _failed_ids = _failed_extractions(text_features_by_id)
+    _retry_at = time.monotonic() + _RETRY_SECONDS
+    return cases, {case.case_id: case for case in cases}, text_features_by_id, columns
+
+
+def _failed_extractions(text_features_by_id: Dict[str, dict]) -> List[str]:
+    """Case_ids that got fallback features (confidence 0) although an API key is set."""
+    if not os.getenv("OPENAI_API_KEY"):
+        # Without a key fallback features are the expected result
+        return []
+    return [case_id for case_id, f in text_features_by_id.items() if f["confidence"] == 0.0]
+
+
+def _retry_failed_extractions(cases_by_id: Dict[str, CaseData], text_features_by_id: Dict[str, dict]) -> None:
+    """Re-extract _failed_ids and update text_features_by_id in place with what succeeds."""
+    global _failed_ids, _retry_at, features_version
+    texts = [cases_by_id[case_id].complaint_text for case_id in _failed_ids]
+    features = extract_text_features_batch(texts)
+    
+    still_failed = []
+    for case_id, f in zip(_failed_ids, features):
+        if f["confidence"] == 0.0:
+            still_failed.append(case_id)
+        else:
+            text_features_by_id[case_id] = f
+    if len(still_failed) < len(_failed_ids):
+        features_version += 1
+    _failed_ids = still_failed
+    _retry_at = time.monotonic() + _RETRY_SECONDS
+
+
+def _retry_due() -> bool:
+    """Whether _load_cases would retry failed text extractions now."""
+    return bool(_failed_ids) and time.monotonic() >= _retry_at
+
+
+def _data_mtime() -> Optional[float]:
+    """Modification time of the cases CSV, or None if it doesn't exist yet."""
+    return os.path.getmtime(DATA_PATH) if os.path.exists(DATA_PATH) else None
+
+
+def _load_cases() -> Tuple[List[CaseData], Dict[str, CaseData], Dict[str, dict], Optional[Dict[str, np.ndarray]]]:
+    """Get the cases, their index, text features and columns, re-reading the CSV only when it changes."""
+    with _load_lock:
+        loaded = _load_cases_at(DATA_PATH, _data_mtime())
+        if _retry_due():
+            _retry_failed_extractions(loaded[1], loaded[2])
+        return loaded
+
+
+def load_cases() -> Tuple[List[CaseData], Dict[str, dict], Optional[Dict[str, np.ndarray]], Optional[float]]:
+    """
+    Load the cases CSV the way the API does, for publishing to workers.
+    
+    Returns:
+        (cases, text features by case_id, numeric columns or None,
+        modification time of the CSV the cases were read from)
+    """
+    with _load_lock:
+        mtime = _data_mtime()
+        cases, _, text_features_by_id, columns = _load_cases_at(DATA_PATH, mtime)
+    return cases, text_features_by_id, columns, mtime
+
+
+def _cases_version() -> Tuple[Optional[float], int, int]:
+    """(CSV mtime, policy version, text features version) the /cases responses depend on."""
+    return _data_mtime(), policy_version, features_version
+
+
 # Policy management - in-memory store (in production, use database)
-policy_rules = {
-    "COMPLAINT_SEVERITY": {"enabled": True, "weight": 1.0, "description": "Severity of complaint type"},
-    "HIGH_DELAY": {"enabled": True, "weight": 1.0, "description": "High delivery delay penalty"},
-    "RESTAURANT_ERROR": {"enabled": True, "weight": 1.0, "description": "Restaurant reliability score"},
-    "CUSTOMER_RISK": {"enabled": True, "weight": 1.0, "description": "Customer refund history risk"},
-    "PHOTO_EVIDENCE": {"enabled": True, "weight": 1.0, "description": "Photo evidence bonus"},
-    "ORDER_VALUE": {"enabled": True, "weight": 1.0, "description": "Order monetary value impact"},
-    "VAGUE_COMPLAINT": {"enabled": True, "weight": 1.0, "description": "Vague complaint penalty"},
-    "TEXT_SIGNALS": {"enabled": True, "weight": 1.0, "description": "LLM text intelligence signals"},
+# Rules are kept as arrays in engine rule order so the batch scorer can
+# use them directly; policy views are projections of these arrays
+RULE_ORDER = RULE_CODES
+
+RULE_DESCRIPTIONS = {
+    "COMPLAINT_SEVERITY": "Severity of complaint type",
+    "HIGH_DELAY": "High delivery delay penalty",
+    "RESTAURANT_ERROR": "Restaurant reliability score",
+    "CUSTOMER_RISK": "Customer refund history risk",
+    "PHOTO_EVIDENCE": "Photo evidence bonus",
+    "ORDER_VALUE": "Order monetary value impact",
+    "VAGUE_COMPLAINT": "Vague complaint penalty",
+    "TEXT_SIGNALS": "LLM text intelligence signals",
 }
 
+policy_weights = np.ones(len(RULE_ORDER), dtype=np.float64)
+policy_enabled = np.ones(len(RULE_ORDER), dtype=np.bool_)
+
+
+def policy_rules() -> Dict[str, dict]:
+    """Human-readable view of the policy arrays, keyed by rule code."""
+    return {
+        code: {
+            "enabled": bool(policy_enabled[i]),
+            "weight": float(policy_weights[i]),
+            "description": RULE_DESCRIPTIONS[code]
+        }
+        for i, code in enumerate(RULE_ORDER)
+    }
+
+
+def _compile_preset(message: str, weights: Dict[str, float], enable: Tuple[str, ...]) -> dict:
+    """
+    Turn a preset spec into index arrays for bulk assignment.
+    
+    Args:
+        message: Message returned when the preset is applied
+        weights: New weight per rule code
+        enable: Rule codes the preset switches on (others keep their state)
+    
+    Returns:
+        Preset with weight_idx/weights/enable_idx arrays and the changes list
+    """
+    return {
+        "message": message,
+        "weight_idx": np.array([RULE_INDEX[code] for code in weights], dtype=np.intp),
+        "weights": np.array(list(weights.values()), dtype=np.float64),
+        "enable_idx": np.array([RULE_INDEX[code] for code in enable], dtype=np.intp),
+        "changes": [
+            f"{code} weight {'increased' if weight > 1 else 'decreased'} to {weight}"
+            for code, weight in weights.items()
+        ],
+    }
+
+
+PRESETS = {
+    # Strict mode: Increase fraud detection
+    "strict": _compile_preset(
+        "Strict mode applied",
+        {"CUSTOMER_RISK": 1.5, "VAGUE_COMPLAINT": 1.3, "PHOTO_EVIDENCE": 1.2},
+        ("CUSTOMER_RISK", "VAGUE_COMPLAINT")
+    ),
+    # Customer-friendly: More lenient
+    "friendly": _compile_preset(
+        "Customer-friendly mode applied",
+        {"CUSTOMER_RISK": 0.5, "PHOTO_EVIDENCE": 1.5, "VAGUE_COMPLAINT": 0.5},
+        ("CUSTOMER_RISK", "PHOTO_EVIDENCE")
+    ),
+    # Delay tolerant: Less penalty for delays
+    "delay-tolerant": _compile_preset(
+        "Delay-tolerant mode applied",
+        {"HIGH_DELAY": 0.5, "COMPLAINT_SEVERITY": 1.2},
+        ("HIGH_DELAY",)
+    ),
+}
+
+
+# Bumped on every policy change; part of the /cases response cache key
+policy_version = 0
+
+# Serialized /cases array elements for all cases and for demo cases only,
+# one comma-joined chunk per _STREAM_CHUNK_ROWS cases, built for the
+# _cases_version() in _precomputed_for
+PRECOMPUTED: Dict[str, List[bytes]] = {}
+_precomputed_for: Optional[Tuple[Optional[float], int, int]] = None
+
+# Returned by /nlp/extract when extraction fails (built and validated once)
+_FALLBACK_FEATURES = TextFeaturesResponse(
+    food_quality_issue=False,
+    missing_item=False,
+    wrong_item=False,
+    temperature_problem=False,
+    packaging_problem=False,
+    delivery_spill=False,
+    vague_complaint=False,
+    customer_aggression=0.0,
+    evidence_strength=0.0,
+    confidence=0.0
+)
+
 # Pydantic models for policy requests
 class PolicyToggleRequest(BaseModel):
     rule_code: str
@@ -78,6 +318,44 @@ class PolicyPresetRequest(BaseModel):
     preset: str
 
 
+@app.on_event("startup")
+async def warm_engine():
+    """Compile the scoring kernels before the first request arrives."""
+    warmup()
+
+
+@app.on_event("startup")
+async def open_http_client():
+    """Create the pooled HTTP client shared by LLM calls."""
+    app.state.http = httpx.AsyncClient(
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=32)
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    """Close the pooled HTTP client."""
+    await app.state.http.aclose()
+
+
+@app.on_event("startup")
+async def attach_shared_cases():
+    """Attach to the cases shared by serve.py, if it started this worker."""
+    global _shared_cases
+    _shared_cases = shared.attach_cases()
+
+
+@app.on_event("startup")
+async def precompute_cases():
+    """Build the /cases responses so the first request is a lookup."""
+    try:
+        await run_in_threadpool(_precompute_cases, _cases_version())
+    except Exception as e:
+        # /cases retries and reports the error on first request
+        print(f"Could not precompute cases: {e}")
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
@@ -92,48 +370,199 @@ async def health_check():
     )
 
 
+# Cases evaluated and serialized per /cases stream chunk
+_STREAM_CHUNK_ROWS = 1_000
+
+
+def _evaluate_cases(
+    cases: List[CaseData],
+    text_features: List[Optional[dict]],
+    weights: np.ndarray,
+    enabled: np.ndarray,
+    columns: Optional[Dict[str, np.ndarray]]
+) -> List[RefundSuggestion]:
+    """
+    Evaluate cases in one batch.
+    
+    When no case has text features the engine's no-text specialization
+    is used. Mixed batches are scored together (rows without text
+    score 0 on the text rules) rather than split and reassembled.
+    """
+    if all(f is None for f in text_features):
+        return engine.evaluate_batch_no_text(cases, weights, enabled, columns)
+    return engine.evaluate_batch(cases, text_features, weights, enabled, columns)
+
+
+def _evaluate_chunks(
+    cases: List[CaseData],
+    text_features_by_id: Dict[str, dict],
+    columns: Optional[Dict[str, np.ndarray]] = None
+) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    Evaluate cases a chunk at a time under the current policy.
+    
+    Yields:
+        (all, demo) comma-joined JSON array elements for each chunk
+    """
+    weights, enabled = policy_weights.copy(), policy_enabled.copy()
+    
+    for start in range(0, len(cases), _STREAM_CHUNK_ROWS):
+        stop = start + _STREAM_CHUNK_ROWS
+        chunk = cases[start:stop]
+        suggestions = _evaluate_cases(
+            chunk,
+            [text_features_by_id.get(case.case_id) for case in chunk],
+            weights,
+            enabled,
+            # Slicing the columns gives views, not copies
+            {name: column[start:stop] for name, column in columns.items()} if columns else None
+        )
+        
+        # Both parts are built by trusted code, so skip re-validation
+        dumped = [
+            CaseWithSuggestion.model_construct(case=case, suggestion=suggestion).model_dump(mode="json")
+            for case, suggestion in zip(chunk, suggestions)
+        ]
+        yield (
+            orjson.dumps(dumped)[1:-1],
+            orjson.dumps([item for item, case in zip(dumped, chunk) if case.is_demo])[1:-1],
+        )
+
+
+def _store_precomputed(version: Tuple[Optional[float], int, int], chunks: List[Tuple[bytes, bytes]]) -> None:
+    """Publish evaluated (all, demo) chunks as the responses for a _cases_version()."""
+    global PRECOMPUTED, _precomputed_for
+    PRECOMPUTED = {
+        "all": [all_part for all_part, _ in chunks],
+        "demo": [demo_part for _, demo_part in chunks],
+    }
+    _precomputed_for = version
+
+
+def _precompute_cases(version: Tuple[Optional[float], int, int]) -> None:
+    """
+    Evaluate all cases once and store the serialized all/demo responses.
+    
+    Args:
+        version: _cases_version() the responses are built for
+    """
+    # Load cases (parsed once per CSV change)
+    cases, _, text_features_by_id, columns = _load_cases()
+    _store_precomputed(version, list(_evaluate_chunks(cases, text_features_by_id, columns)))
+
+
+def _rank_cases(demo_only: bool, top_k: Optional[int], offset: int, limit: Optional[int]) -> bytes:
+    """
+    Serialize the highest scoring cases, ordered by score descending.
+    
+    Every case is scored, but only the returned page is turned into
+    suggestions.
+    
+    Args:
+        demo_only: Rank only demo cases
+        top_k: Keep at most this many of the highest scoring cases
+        offset: Number of ranked cases to skip
+        limit: Maximum number of ranked cases to return
+    
+    Returns:
+        JSON array of cases with refund suggestions
+    """
+    cases, _, text_features_by_id, columns = _load_cases()
+    weights, enabled = policy_weights.copy(), policy_enabled.copy()
+    if demo_only:
+        idx = np.fromiter((i for i, case in enumerate(cases) if case.is_demo), dtype=np.intp)
+        cases = [cases[i] for i in idx]
+        columns = {name: column[idx] for name, column in columns.items()} if columns else None
+    
+    text_features = [text_features_by_id.get(case.case_id) for case in cases]
+    scores = engine.score_only_batch(cases, text_features, weights, enabled, columns)
+    
+    # Stable, so ties keep the CSV order
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    order = order[offset:None if limit is None else offset + limit]
+    
+    page = [cases[i] for i in order]
+    suggestions = _evaluate_cases(
+        page,
+        [text_features[i] for i in order],
+        weights,
+        enabled,
+        {name: column[order] for name, column in columns.items()} if columns else None
+    )
+    return orjson.dumps([
+        CaseWithSuggestion.model_construct(case=case, suggestion=suggestion).model_dump(mode="json")
+        for case, suggestion in zip(page, suggestions)
+    ])
+
+
+async def _iter_parts(parts: List[bytes]) -> AsyncIterator[bytes]:
+    """Async iterator over already serialized chunks."""
+    for part in parts:
+        yield part
+
+
+async def _json_array(parts: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Wrap comma-joined element chunks into a streamed JSON array."""
+    yield b"["
+    first = True
+    async for part in parts:
+        if not part:
+            continue
+        yield part if first else b"," + part
+        first = False
+    yield b"]"
+
+
 @app.get("/cases", response_model=List[CaseWithSuggestion])
-async def get_cases_with_suggestions(demo_only: bool = False):
+async def get_cases_with_suggestions(
+    demo_only: bool = False,
+    top_k: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1)
+):
     """
     Get all cases with computed refund suggestions.
     
     This endpoint:
     1. Loads all cases from the CSV dataset
     2. Evaluates each case using the rule-based engine
-    3. Returns cases with their computed suggestions
+    3. Streams cases with their computed suggestions as a JSON array
+    
+    With top_k, offset or limit the cases are instead ranked by score
+    (highest first) and only the requested page is returned.
     
     Args:
         demo_only: If True, return only demo cases (is_demo=True)
+        top_k: Rank cases and keep only the top_k highest scoring
+        offset: Skip this many ranked cases
+        limit: Return at most this many ranked cases
     
     Returns:
         List of cases with refund suggestions
     """
     try:
-        # Load cases from CSV
-        cases = load_cases_from_csv(DATA_PATH)
+        if top_k is not None or offset or limit is not None:
+            body = await run_in_threadpool(_rank_cases, demo_only, top_k, offset, limit)
+            return Response(body, media_type="application/json")
         
-        if not cases:
-            return []
+        key = "demo" if demo_only else "all"
+        if _cases_version() == _precomputed_for and not _retry_due():
+            return StreamingResponse(_json_array(_iter_parts(PRECOMPUTED[key])), media_type="application/json")
         
-        # Filter by demo_only if requested
-        if demo_only:
-            cases = [case for case in cases if case.is_demo]
+        # The CSV or the policy changed, or failed text extractions are due
+        # for a retry. Load up front so errors still map to a 500, then
+        # evaluate chunk by chunk while the response streams
+        cases, _, text_features_by_id, columns = await run_in_threadpool(_load_cases)
+        version = _cases_version()
         
-        # Compute suggestions for each case
-        results = []
-        for case in cases:
-            # Extract text features if complaint_text is available
-            text_features = None
-            if case.complaint_text:
-                text_features = extract_text_features(case.complaint_text)
-            
-            suggestion = engine.evaluate_case(case, text_features)
-            results.append(CaseWithSuggestion(
-                case=case,
-                suggestion=suggestion
-            ))
+        async def evaluate_and_stream():
+            chunks = []
+            async for pair in iterate_in_threadpool(_evaluate_chunks(cases, text_features_by_id, columns)):
+                chunks.append(pair)
+                yield pair[1] if demo_only else pair[0]
+            _store_precomputed(version, chunks)
         
-        return results
+        return StreamingResponse(_json_array(evaluate_and_stream()), media_type="application/json")
     
     except FileNotFoundError:
         raise HTTPException(
@@ -162,15 +591,9 @@ async def get_case_by_id(case_id: str):
         404: If case not found
     """
     try:
-        # Load all cases from CSV
-        cases = load_cases_from_csv(DATA_PATH)
-        
-        # Find the specific case
-        target_case = None
-        for case in cases:
-            if case.case_id == case_id:
-                target_case = case
-                break
+        # Look up the case in the case_id index (first call parses the CSV)
+        _, cases_by_id, text_features_by_id, _ = await run_in_threadpool(_load_cases)
+        target_case = cases_by_id.get(case_id)
         
         if target_case is None:
             raise HTTPException(
@@ -178,18 +601,25 @@ async def get_case_by_id(case_id: str):
                 detail=f"Case {case_id} not found"
             )
         
-        # Extract text features if complaint_text is available
-        text_features = None
-        if target_case.complaint_text:
-            text_features = extract_text_features(target_case.complaint_text)
+        # Text features were extracted when the cases were loaded
+        text_features = text_features_by_id.get(case_id)
         
-        # Compute suggestion for the case
-        suggestion = engine.evaluate_case(target_case, text_features)
+        # Compute suggestion for the case under the current policy
+        suggestion = (await run_in_threadpool(
+            _evaluate_cases,
+            [target_case],
+            [text_features],
+            policy_weights.copy(),
+            policy_enabled.copy(),
+            None
+        ))[0]
         
-        return CaseWithSuggestion(
+        # Both parts are built by trusted code; serialize directly rather
+        # than have FastAPI re-validate against response_model
+        return ORJSONResponse(CaseWithSuggestion.model_construct(
             case=target_case,
             suggestion=suggestion
-        )
+        ).model_dump(mode="json"))
     
     except HTTPException:
         raise
@@ -228,26 +658,71 @@ async def extract_features_from_text(request: TextFeaturesRequest):
             )
         
         # Extract features
-        features = extract_text_features(request.text.strip())
+        # Reuse the pooled connections (not set if startup hooks didn't run)
+        features = await extract_text_features_async(
+            request.text.strip(),
+            http_client=getattr(app.state, "http", None)
+        )
         
-        return TextFeaturesResponse(**features)
+        # LLM output is validated here once; skip the response_model pass
+        return ORJSONResponse(TextFeaturesResponse(**features).model_dump())
     
     except HTTPException:
         raise
     except Exception as e:
         # If extraction fails, return fallback
-        return TextFeaturesResponse(
-            food_quality_issue=False,
-            missing_item=False,
-            wrong_item=False,
-            temperature_problem=False,
-            packaging_problem=False,
-            delivery_spill=False,
-            vague_complaint=False,
-            customer_aggression=0.0,
-            evidence_strength=0.0,
-            confidence=0.0
-        )
+        return ORJSONResponse(_FALLBACK_FEATURES.model_dump())
+
+
+@lru_cache(maxsize=1024)
+def _impact(
+    orders_per_day: float,
+    complaint_rate: float,
+    avg_order_value: float,
+    current_refund_rate: float,
+    improvement_pct: float
+) -> dict:
+    """
+    Compute business impact figures (cached: the result depends only on the inputs).
+    
+    Returns:
+        Impact data with current costs and improvement scenarios
+    """
+    # Calculate current metrics
+    complaints_per_day = orders_per_day * complaint_rate
+    complaints_per_year = complaints_per_day * 365
+    
+    refunds_per_year = complaints_per_year * current_refund_rate
+    current_annual_cost = refunds_per_year * avg_order_value
+    
+    # Assume 15 minutes per case
+    minutes_per_case = 15
+    current_hours_per_year = (complaints_per_year * minutes_per_case) / 60
+    
+    # Generate improvement scenarios
+    improvement_levels = [0.05, 0.10, 0.15, 0.20]
+    scenarios = []
+    
+    for improvement in improvement_levels:
+        # Calculate savings
+        cases_prevented = complaints_per_year * improvement
+        refunds_prevented = cases_prevented * current_refund_rate
+        annual_savings = refunds_prevented * avg_order_value
+        time_saved_hours = (cases_prevented * minutes_per_case) / 60
+        
+        scenarios.append({
+            "improvement_pct": improvement,
+            "annual_savings": round(annual_savings, 2),
+            "cases_prevented": round(cases_prevented),
+            "time_saved_hours": round(time_saved_hours)
+        })
+    
+    return {
+        "current_annual_cost": round(current_annual_cost, 2),
+        "current_cases_per_year": round(complaints_per_year),
+        "current_hours_per_year": round(current_hours_per_year),
+        "scenarios": scenarios
+    }
 
 
 @app.get("/impact")
@@ -272,41 +747,13 @@ async def get_impact(
         Impact data with current costs and improvement scenarios
     """
     try:
-        # Calculate current metrics
-        complaints_per_day = orders_per_day * complaint_rate
-        complaints_per_year = complaints_per_day * 365
-        
-        refunds_per_year = complaints_per_year * current_refund_rate
-        current_annual_cost = refunds_per_year * avg_order_value
-        
-        # Assume 15 minutes per case
-        minutes_per_case = 15
-        current_hours_per_year = (complaints_per_year * minutes_per_case) / 60
-        
-        # Generate improvement scenarios
-        improvement_levels = [0.05, 0.10, 0.15, 0.20]
-        scenarios = []
-        
-        for improvement in improvement_levels:
-            # Calculate savings
-            cases_prevented = complaints_per_year * improvement
-            refunds_prevented = cases_prevented * current_refund_rate
-            annual_savings = refunds_prevented * avg_order_value
-            time_saved_hours = (cases_prevented * minutes_per_case) / 60
-            
-            scenarios.append({
-                "improvement_pct": improvement,
-                "annual_savings": round(annual_savings, 2),
-                "cases_prevented": round(cases_prevented),
-                "time_saved_hours": round(time_saved_hours)
-            })
-        
-        return {
-            "current_annual_cost": round(current_annual_cost, 2),
-            "current_cases_per_year": round(complaints_per_year),
-            "current_hours_per_year": round(current_hours_per_year),
-            "scenarios": scenarios
-        }
+        return ORJSONResponse(_impact(
+            orders_per_day,
+            complaint_rate,
+            avg_order_value,
+            current_refund_rate,
+            improvement_pct
+        ))
     
     except Exception as e:
         raise HTTPException(
@@ -330,7 +777,7 @@ async def get_policy():
             "weight": data["weight"],
             "description": data["description"]
         }
-        for code, data in policy_rules.items()
+        for code, data in policy_rules().items()
     ]
     return {"rules": rules}
 
@@ -348,17 +795,20 @@ async def toggle_policy_rule(request: PolicyToggleRequest):
     """
     rule_code = request.rule_code
     
-    if rule_code not in policy_rules:
+    i = RULE_INDEX.get(rule_code)
+    if i is None:
         raise HTTPException(
             status_code=404,
             detail=f"Rule {rule_code} not found"
         )
     
-    policy_rules[rule_code]["enabled"] = not policy_rules[rule_code]["enabled"]
+    global policy_version
+    policy_enabled[i] ^= True
+    policy_version += 1
     
     return {
         "message": f"Rule {rule_code} toggled",
-        "enabled": policy_rules[rule_code]["enabled"]
+        "enabled": bool(policy_enabled[i])
     }
 
 
@@ -376,7 +826,8 @@ async def update_policy_weight(request: PolicyWeightRequest):
     rule_code = request.rule_code
     weight = request.weight
     
-    if rule_code not in policy_rules:
+    i = RULE_INDEX.get(rule_code)
+    if i is None:
         raise HTTPException(
             status_code=404,
             detail=f"Rule {rule_code} not found"
@@ -388,7 +839,9 @@ async def update_policy_weight(request: PolicyWeightRequest):
             detail="Weight must be between 0 and 2"
         )
     
-    policy_rules[rule_code]["weight"] = weight
+    global policy_version
+    policy_weights[i] = weight
+    policy_version += 1
     
     return {
         "message": f"Rule {rule_code} weight updated",
@@ -407,58 +860,23 @@ async def apply_policy_preset(request: PolicyPresetRequest):
     Returns:
         Success message with applied changes
     """
-    preset = request.preset.lower()
-    
-    if preset == "strict":
-        # Strict mode: Increase fraud detection
-        policy_rules["CUSTOMER_RISK"]["weight"] = 1.5
-        policy_rules["CUSTOMER_RISK"]["enabled"] = True
-        policy_rules["VAGUE_COMPLAINT"]["weight"] = 1.3
-        policy_rules["VAGUE_COMPLAINT"]["enabled"] = True
-        policy_rules["PHOTO_EVIDENCE"]["weight"] = 1.2
-        return {
-            "message": "Strict mode applied",
-            "changes": [
-                "CUSTOMER_RISK weight increased to 1.5",
-                "VAGUE_COMPLAINT weight increased to 1.3",
-                "PHOTO_EVIDENCE weight increased to 1.2"
-            ]
-        }
+    global policy_version
+    preset = PRESETS.get(request.preset.lower())
     
-    elif preset == "friendly":
-        # Customer-friendly: More lenient
-        policy_rules["CUSTOMER_RISK"]["weight"] = 0.5
-        policy_rules["CUSTOMER_RISK"]["enabled"] = True
-        policy_rules["PHOTO_EVIDENCE"]["weight"] = 1.5
-        policy_rules["PHOTO_EVIDENCE"]["enabled"] = True
-        policy_rules["VAGUE_COMPLAINT"]["weight"] = 0.5
-        return {
-            "message": "Customer-friendly mode applied",
-            "changes": [
-                "CUSTOMER_RISK weight decreased to 0.5",
-                "PHOTO_EVIDENCE weight increased to 1.5",
-                "VAGUE_COMPLAINT weight decreased to 0.5"
-            ]
-        }
-    
-    elif preset == "delay-tolerant":
-        # Delay tolerant: Less penalty for delays
-        policy_rules["HIGH_DELAY"]["weight"] = 0.5
-        policy_rules["HIGH_DELAY"]["enabled"] = True
-        policy_rules["COMPLAINT_SEVERITY"]["weight"] = 1.2
-        return {
-            "message": "Delay-tolerant mode applied",
-            "changes": [
-                "HIGH_DELAY weight decreased to 0.5",
-                "COMPLAINT_SEVERITY weight increased to 1.2"
-            ]
-        }
-    
-    else:
+    if preset is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Unknown preset: {preset}. Use 'strict', 'friendly', or 'delay-tolerant'"
+            detail=f"Unknown preset: {request.preset.lower()}. Use 'strict', 'friendly', or 'delay-tolerant'"
         )
+    
+    policy_weights[preset["weight_idx"]] = preset["weights"]
+    policy_enabled[preset["enable_idx"]] = True
+    policy_version += 1
+    
+    return {
+        "message": preset["message"],
+        "changes": preset["changes"]
+    }
 
 
 @app.exception_handler(Exception)
@@ -0,0 +1,36 @@
+"""
+Run the API with several uvicorn workers sharing one loaded copy of the cases.
+
+Usage:
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import os
+
+import uvicorn
+
+from app import shared
+from main import DATA_PATH, load_cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    
+    # Parse the CSV and extract text features once here; workers attach
+    # to the result in their startup hook instead of loading it again
+    cases, text_features_by_id, columns, mtime = load_cases()
+    blocks, spec = shared.publish_cases(cases, text_features_by_id, columns, DATA_PATH, mtime)
+    os.environ[shared.ENV_VAR] = spec
+    
+    try:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers)
+    finally:
+        shared.release(blocks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Parity tests: the batch scoring paths must agree with evaluate_case.
+
+evaluate_case is the reference. evaluate_batch, evaluate_batch_no_text
+and score_only_batch are checked against it under default and
+non-default policy weights, with the Numba kernels and with the NumPy
+fallback. Parallel and streamed scoring are checked against
+score_cases_batch.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+import os
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+
+from app import engine as engine_module
+from app.data import iter_cases_from_csv, load_cases_from_csv
+from app.engine import (
+    RULE_CODES, RULE_INDEX, RefundDecisionEngine, score_case_batches, score_cases_batch, score_cases_parallel
+)
+from app.schemas import CaseData, ComplaintType
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "cases.csv")
+
+# Reason factor -> rule code; factors not listed are TEXT_SIGNALS
+FACTOR_RULES = {
+    "Complaint Severity": "COMPLAINT_SEVERITY",
+    "Delivery Delay": "HIGH_DELAY",
+    "Restaurant Reliability": "RESTAURANT_ERROR",
+    "Customer History": "CUSTOMER_RISK",
+    "Evidence Quality": "PHOTO_EVIDENCE",
+    "Order Value": "ORDER_VALUE",
+    "TEXT_SIGNAL_VagueComplaint": "VAGUE_COMPLAINT",
+}
+
+# Weights are exact binary fractions so weighted sums carry no rounding
+# error and threshold comparisons can't flip between paths
+POLICIES = {
+    "default": (None, None),
+    "weighted": (
+        np.array([1.5, 0.5, 2.0, 0.25, 1.75, 0.0, 1.5, 0.5]),
+        np.array([True, True, False, True, True, True, True, False]),
+    ),
+}
+
+
+def _random_case(rng: random.Random, i: int) -> CaseData:
+    """A random case, biased towards the rule thresholds."""
+    return CaseData(
+        case_id=f"CASE{i:05d}",
+        order_value=rng.choice([rng.uniform(0, 150), 19.99, 20, 50, 100]),
+        delivery_delay_min=rng.choice([rng.randint(0, 120), 14, 15, 30, 60]),
+        restaurant_error_rate=rng.choice([round(rng.uniform(0, 0.5), 2), 0.05, 0.15, 0.3]),
+        customer_refund_rate=rng.choice([round(rng.uniform(0, 0.6), 2), 0.1, 0.2, 0.4]),
+        complaint_type=rng.choice(list(ComplaintType)),
+        photo_provided=rng.random() < 0.5,
+    )
+
+
+def _random_features(rng: random.Random) -> dict:
+    """Random text features, sometimes with zero confidence (ignored by the engine)."""
+    return {
+        "food_quality_issue": rng.random() < 0.5,
+        "missing_item": rng.random() < 0.5,
+        "wrong_item": rng.random() < 0.5,
+        "temperature_problem": rng.random() < 0.5,
+        "packaging_problem": rng.random() < 0.5,
+        "delivery_spill": rng.random() < 0.5,
+        "vague_complaint": rng.random() < 0.5,
+        "customer_aggression": rng.random(),
+        "evidence_strength": rng.random(),
+        "confidence": rng.choice([0.0, 0.5, 0.9]),
+    }
+
+
+def _backends():
+    """(backend name, numba flag) for every scoring backend available here."""
+    backends = [("numba", True)] if engine_module._NUMBA_AVAILABLE else []
+    backends.append(("numpy", False))
+    return backends
+
+
+class EngineParityTest(unittest.TestCase):
+    """Batch results must match evaluate_case, reweighted the way the policy says."""
+    
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(1234)
+        cls.engine = RefundDecisionEngine()
+        cls.cases = [_random_case(rng, i) for i in range(2000)]
+        cls.features = [_random_features(rng) if rng.random() < 0.7 else None for _ in cls.cases]
+    
+    def _expected(self, case, features, weights, enabled):
+        """
+        Reference suggestion: evaluate_case's reasons scaled by rule weight.
+        
+        Returns:
+            (unrounded score, action, confidence, [(factor, explanation, impact)])
+        """
+        if weights is None:
+            weights, enabled = np.ones(len(RULE_CODES)), np.ones(len(RULE_CODES), dtype=bool)
+        
+        score = 0.0
+        reasons = []
+        for r in self.engine.evaluate_case(case, features).reasons:
+            i = RULE_INDEX[FACTOR_RULES.get(r.factor, "TEXT_SIGNALS")]
+            weight = weights[i] if enabled[i] else 0.0
+            score += r.impact * weight
+            if weight == 1:
+                reasons.append((r.factor, r.explanation, r.impact))
+            elif weight != 0:
+                reasons.append((r.factor, r.explanation, round(r.impact * weight, 2)))
+        action, confidence = self.engine._score_to_action(score, case)
+        return score, action, confidence, reasons
+    
+    def _runs(self):
+        """(policy name, backend name, weights, enabled, numba flag) for every combination available here."""
+        return [
+            (policy, backend, weights, enabled, use_numba)
+            for policy, (weights, enabled) in POLICIES.items()
+            for backend, use_numba in _backends()
+        ]
+    
+    def _assert_matches(self, suggestions, features, weights, enabled):
+        self.assertEqual(len(suggestions), len(self.cases))
+        for case, f, got in zip(self.cases, features, suggestions):
+            score, action, confidence, reasons = self._expected(case, f, weights, enabled)
+            self.assertEqual(got.action, action, case.case_id)
+            self.assertAlmostEqual(got.score, round(score, 2), places=9, msg=case.case_id)
+            self.assertAlmostEqual(got.confidence, confidence, places=9, msg=case.case_id)
+            self.assertEqual(
+                [(r.factor, r.explanation, r.impact) for r in got.reasons], reasons, case.case_id
+            )
+    
+    def test_evaluate_batch(self):
+        for policy, backend, weights, enabled, use_numba in self._runs():
+            with self.subTest(policy=policy, backend=backend), \
+                    mock.patch.object(engine_module, "_NUMBA_AVAILABLE", use_numba):
+                suggestions = self.engine.evaluate_batch(self.cases, self.features, weights, enabled)
+                self._assert_matches(suggestions, self.features, weights, enabled)
+    
+    def test_evaluate_batch_no_text(self):
+        no_text = [None] * len(self.cases)
+        for policy, backend, weights, enabled, use_numba in self._runs():
+            with self.subTest(policy=policy, backend=backend), \
+                    mock.patch.object(engine_module, "_NUMBA_AVAILABLE", use_numba):
+                suggestions = self.engine.evaluate_batch_no_text(self.cases, weights, enabled)
+                self._assert_matches(suggestions, no_text, weights, enabled)
+    
+    def test_score_only_batch(self):
+        for policy, backend, weights, enabled, use_numba in self._runs():
+            with self.subTest(policy=policy, backend=backend), \
+                    mock.patch.object(engine_module, "_NUMBA_AVAILABLE", use_numba):
+                scores = self.engine.score_only_batch(self.cases, self.features, weights, enabled)
+                expected = [
+                    self._expected(case, f, weights, enabled)[0]
+                    for case, f in zip(self.cases, self.features)
+                ]
+                np.testing.assert_allclose(scores, expected, rtol=0, atol=1e-9)
+
+
+class ParallelScoringTest(unittest.TestCase):
+    """score_cases_parallel must match score_cases_batch on both executor paths."""
+    
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(5678)
+        # Enough rows to take the parallel path, split unevenly across workers
+        cls.cases = [_random_case(rng, i) for i in range(engine_module._MIN_PARALLEL_ROWS + 2345)]
+        cls.features = [_random_features(rng) if rng.random() < 0.7 else None for _ in cls.cases]
+    
+    def _check(self, executor_name, executor_cls, use_numba, gil_disabled):
+        with mock.patch.object(engine_module, "_NUMBA_AVAILABLE", use_numba), \
+                mock.patch.object(engine_module, "_gil_disabled", lambda: gil_disabled):
+            for text_features in (self.features, None):
+                with self.subTest(text=text_features is not None), \
+                        mock.patch.object(engine_module, executor_name, wraps=executor_cls) as executor:
+                    scores = score_cases_parallel(self.cases, text_features, max_workers=3)
+                    executor.assert_called_once_with(max_workers=3)
+                    np.testing.assert_allclose(
+                        scores, score_cases_batch(self.cases, text_features), rtol=0, atol=1e-9
+                    )
+    
+    def test_threads(self):
+        for backend, use_numba in _backends():
+            with self.subTest(backend=backend):
+                # Without numba, threads are only used on free-threaded builds
+                self._check("ThreadPoolExecutor", ThreadPoolExecutor, use_numba, gil_disabled=not use_numba)
+    
+    def test_processes(self):
+        self._check("ProcessPoolExecutor", ProcessPoolExecutor, use_numba=False, gil_disabled=False)
+    
+    def test_small_input_runs_inline(self):
+        with mock.patch.object(engine_module, "ThreadPoolExecutor") as threads, \
+                mock.patch.object(engine_module, "ProcessPoolExecutor") as processes:
+            scores = score_cases_parallel(self.cases[:100], self.features[:100], max_workers=3)
+        threads.assert_not_called()
+        processes.assert_not_called()
+        np.testing.assert_array_equal(scores, score_cases_batch(self.cases[:100], self.features[:100]))
+
+
+class StreamedScoringTest(unittest.TestCase):
+    """score_case_batches over iter_cases_from_csv must match scoring the whole file."""
+    
+    def test_bundled_csv(self):
+        cases = load_cases_from_csv(DATA_PATH)
+        for backend, use_numba in _backends():
+            for batch_size in (1, 7, len(cases), 10_000):
+                with self.subTest(backend=backend, batch_size=batch_size), \
+                        mock.patch.object(engine_module, "_NUMBA_AVAILABLE", use_numba):
+                    batches = list(score_case_batches(iter_cases_from_csv(DATA_PATH, batch_size)))
+                    self.assertEqual([len(b) for b in batches[:-1]], [batch_size] * (len(batches) - 1))
+                    np.testing.assert_array_equal(np.concatenate(batches), score_cases_batch(cases))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,232 @@
+"""
+Tests for validating LLM output in app.nlp.
+
+The OpenAI client is replaced with a fake that returns canned
+completions, so no API key or network access is needed.
+
+Run with:
+    python -m unittest discover -s tests
+"""
+import json
+import types
+import unittest
+from unittest import mock
+
+from app import nlp
+
+GOOD = {
+    "food_quality_issue": True,
+    "missing_item": False,
+    "wrong_item": False,
+    "temperature_problem": False,
+    "packaging_problem": False,
+    "delivery_spill": False,
+    "vague_complaint": False,
+    "customer_aggression": 0.1,
+    "evidence_strength": 0.5,
+    "confidence": 0.9,
+}
+
+
+def _features(**overrides) -> dict:
+    """GOOD with some fields replaced."""
+    return {**GOOD, **overrides}
+
+
+class _FakeClient:
+    """Stands in for AsyncOpenAI; reply(user_prompt) gives the completion content."""
+    
+    def __init__(self, reply):
+        self.prompts = []
+        
+        async def create(messages, **kwargs):
+            prompt = messages[-1]["content"]
+            self.prompts.append(prompt)
+            message = types.SimpleNamespace(content=reply(prompt))
+            return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)])
+        
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=create))
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class ParseFeaturesTest(unittest.TestCase):
+
+    def test_valid(self):
+        features = nlp._parse_features(_features())
+        self.assertEqual(features, GOOD)
+    
+    def test_clamps_and_converts_floats(self):
+        features = nlp._parse_features(
+            _features(customer_aggression=1.7, evidence_strength=-0.2, confidence="0.7")
+        )
+        self.assertEqual(features["customer_aggression"], 1.0)
+        self.assertEqual(features["evidence_strength"], 0.0)
+        self.assertEqual(features["confidence"], 0.7)
+    
+    def test_accepts_zero_and_one_as_booleans(self):
+        features = nlp._parse_features(_features(missing_item=1, food_quality_issue=0))
+        self.assertIs(features["missing_item"], True)
+        self.assertIs(features["food_quality_issue"], False)
+    
+    def test_rejects_non_boolean_flags(self):
+        for value in ["false", "true", "yes", None, 2, 0.5, [], {}]:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                nlp._parse_features(_features(missing_item=value))
+    
+    def test_rejects_non_numeric_floats(self):
+        for value in [None, "high", [], {}]:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                nlp._parse_features(_features(confidence=value))
+    
+    def test_rejects_missing_fields_and_non_objects(self):
+        incomplete = dict(GOOD)
+        del incomplete["delivery_spill"]
+        for payload in [incomplete, None, [GOOD], "{}", 5]:
+            with self.subTest(payload=payload), self.assertRaises(ValueError):
+                nlp._parse_features(payload)
+
+
+class ExtractBatchTest(unittest.TestCase):
+    """Malformed completions only cost the complaints they were for."""
+    
+    def setUp(self):
+        patches = [
+            mock.patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}),
+            mock.patch.object(nlp, "_DISK_CACHE_PATH", ""),
+            mock.patch.object(nlp, "_disk", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        nlp.clear_cache()
+        self.addCleanup(nlp.clear_cache)
+    
+    def _extract(self, texts, reply, packed=False):
+        client = _FakeClient(reply)
+        with mock.patch.object(nlp, "_get_async_client", lambda http_client=None: client):
+            return nlp.extract_text_features_batch(texts, packed=packed), client
+    
+    def test_single_requests(self):
+        bodies = {
+            "good": json.dumps(GOOD),
+            "string-bool": json.dumps(_features(missing_item="false")),
+            "null-confidence": json.dumps(_features(confidence=None)),
+            "not-json": "Sorry, I can't help with that.",
+            "empty": None,
+            "list": "[1, 2]",
+        }
+        results, _ = self._extract(list(bodies), lambda prompt: bodies[prompt])
+        self.assertEqual(results[0], GOOD)
+        for text, features in zip(list(bodies)[1:], results[1:]):
+            self.assertEqual(features, nlp._get_fallback_features(), text)
+    
+    def test_packed_bad_item(self):
+        def reply(prompt):
+            return json.dumps({"results": [GOOD, _features(wrong_item="no"), 5]})
+        
+        results, client = self._extract(["one", "two", "three"], reply, packed=True)
+        self.assertEqual(len(client.prompts), 1)
+        self.assertEqual(results[0], GOOD)
+        self.assertEqual(results[1], nlp._get_fallback_features())
+        self.assertEqual(results[2], nlp._get_fallback_features())
+    
+    def test_packed_bad_payload(self):
+        replies = {
+            "wrong length": json.dumps({"results": [GOOD]}),
+            "not a list": json.dumps({"results": GOOD}),
+            "not an object": json.dumps([GOOD, GOOD]),
+            "not json": "results: none",
+        }
+        for name, body in replies.items():
+            with self.subTest(name):
+                nlp.clear_cache()
+                results, _ = self._extract(["one", "two"], lambda prompt: body, packed=True)
+                self.assertEqual(results, [nlp._get_fallback_features()] * 2)
+    
+    def test_packed_chunks(self):
+        texts = [f"complaint {i}" for i in range(nlp._PACK_SIZE + 3)]
+        
+        def reply(prompt):
+            count = prompt.count("complaint ")
+            return json.dumps({"results": [_features(confidence=0.5)] * count})
+        
+        results, client = self._extract(texts, reply, packed=True)
+        self.assertEqual(len(client.prompts), 2)
+        self.assertEqual([f["confidence"] for f in results], [0.5] * len(texts))
+
+
+
+class QuickExtractTest(unittest.TestCase):
+    """Keyword features are only trusted for unambiguous complaints."""
+    
+    CLEAR = "The soup was cold and spilled all over the bag"
+    AMBIGUOUS = [
+        "Nothing was missing and the food wasn't cold, the driver was just rude",
+        "Driver took the wrong turn and got here late",
+        "no complaints about the packaging, it was just slow",
+        "I never had my order spilled before",
+    ]
+    
+    def setUp(self):
+        patches = [
+            mock.patch.dict("os.environ", {"OPENAI_API_KEY": ""}),
+            mock.patch.object(nlp, "_DISK_CACHE_PATH", ""),
+            mock.patch.object(nlp, "_disk", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        nlp.clear_cache()
+        self.addCleanup(nlp.clear_cache)
+    
+    def _pattern_backends(self):
+        """Context managers for each keyword matcher available here."""
+        backends = [("re", mock.patch.object(nlp, "_PATTERN_DB", None))]
+        if nlp._PATTERN_DB is not None:
+            backends.append(("hyperscan", mock.patch.object(nlp, "_PATTERN_DB", nlp._PATTERN_DB)))
+        return backends
+    
+    def test_clear_complaint(self):
+        for backend, patch in self._pattern_backends():
+            with self.subTest(backend=backend), patch:
+                features = nlp.quick_extract(self.CLEAR)
+                self.assertGreaterEqual(features["confidence"], nlp._QUICK_CONFIDENCE)
+                self.assertTrue(features["temperature_problem"])
+                self.assertTrue(features["delivery_spill"])
+                self.assertFalse(features["missing_item"])
+    
+    def test_negated_or_single_keyword_is_ambiguous(self):
+        for backend, patch in self._pattern_backends():
+            for text in self.AMBIGUOUS:
+                with self.subTest(backend=backend, text=text), patch:
+                    self.assertLess(nlp.quick_extract(text)["confidence"], nlp._QUICK_CONFIDENCE)
+    
+    def test_numbers_are_not_evidence(self):
+        for text in ["It took 12 minutes and the food was cold", "Ordered at 7 30, the food was cold"]:
+            with self.subTest(text=text):
+                self.assertEqual(nlp.quick_extract(text)["evidence_strength"], 0.3)
+        self.assertEqual(nlp.quick_extract("Photo attached, food was cold")["evidence_strength"], 0.7)
+    
+    def test_no_key_uses_keywords_only_when_unambiguous(self):
+        results = nlp.extract_text_features_batch([self.CLEAR, *self.AMBIGUOUS])
+        self.assertEqual(results[0], nlp.quick_extract(self.CLEAR))
+        for text, features in zip(self.AMBIGUOUS, results[1:]):
+            self.assertEqual(features, nlp._get_fallback_features(), text)
+    
+    def test_key_sends_clear_complaints_to_the_llm(self):
+        nlp.extract_text_features_batch([self.CLEAR])
+        client = _FakeClient(lambda prompt: json.dumps(_features(confidence=0.95)))
+        with mock.patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test"}), \
+                mock.patch.object(nlp, "_get_async_client", lambda http_client=None: client):
+            features = nlp.extract_text_features(self.CLEAR)
+        self.assertEqual(client.prompts, [self.CLEAR])
+        self.assertEqual(features["confidence"], 0.95)
+
+
+if __name__ == "__main__":
+    unittest.main()